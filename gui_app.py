@@ -10,25 +10,37 @@ Run with: streamlit run gui_app.py
 import streamlit as st
 import subprocess
 import json
+import io
 from pathlib import Path
 from datetime import datetime, timedelta
 import configparser
 import os
+import importlib
+import tempfile
+import zipfile
+from math import radians, cos
+from contextlib import nullcontext
+from typing import NamedTuple
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 os.environ['USE_PYGEOS'] = '0'  # Use Shapely 2.0 instead of PyGEOS
-import folium
-from streamlit_folium import st_folium
-from folium.plugins import Draw
-import geopandas as gpd
-from shapely.geometry import shape, box
-from pyproj import Transformer
-import rasterio
+from shapely.geometry import shape, Polygon
+from shapely.prepared import prep
+from shapely.ops import transform as shapely_transform
+import shapely
+import numpy as np
 
 # Import environment variable configuration for binary paths
 from src.config import (
     get_snowpack_bin, get_meteoio_bin, get_alpine3d_bin,
-    get_cache_dir, get_output_dir, get_template_dir
+    get_cache_dir, get_output_dir, get_template_dir, get_build_info,
+    is_imis_available, is_run_tab_enabled
 )
 
+# Cache for downloaded DEMs (OpenTopography)
+from src.data.cache import CacheManager
+
 # Import embedded templates for web-hosted version
 from src.templates import get_template
 
@@ -39,27 +51,133 @@ st.set_page_config(
 )
 
 # Helper functions
-def get_build_info():
+# Heavy map/GIS libraries (folium, streamlit_folium, geopandas, pyproj,
+# pyogrio, rasterio) are imported on first use with importlib.import_module
+# instead of at page load; later reruns get them from sys.modules
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _scan_shapefiles(base_dir, dir_mtime):
     """
-    Read and parse BUILD_INFO.txt if it exists (Docker environment).
+    Recursively collect .shp files below a directory using os.scandir.
+
+    Args:
+        base_dir: Directory to search (str)
+        dir_mtime: Modification time of base_dir, only used to invalidate the cache
 
     Returns:
-        dict: Build information or None if not found
+        list: Sorted shapefile paths as strings
     """
-    build_info_path = Path("BUILD_INFO.txt")
-    if build_info_path.exists():
+    shapefiles = []
+    pending = [base_dir]
+    while pending:
+        current = pending.pop()
         try:
-            with open(build_info_path, 'r') as f:
-                content = f.read()
-            return content
-        except Exception as e:
-            return None
-    return None
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif entry.name.endswith(".shp") and entry.is_file():
+                        shapefiles.append(entry.path)
+        except OSError:
+            continue
+    return sorted(shapefiles, key=lambda p: Path(p).parts)
+
+# Selectbox choices with precomputed option -> index maps
+_GSD_REF_CHOICES = (0.5, 2.0)
+_GSD_REF_IDX = {v: i for i, v in enumerate(_GSD_REF_CHOICES)}
+_COORD_SYS_CHOICES = ("CH1903+", "CH1903 (Legacy)")
+_COORD_SYS_IDX = {v: i for i, v in enumerate(_COORD_SYS_CHOICES)}
+_LUS_SOURCE_CHOICES = ("SwissTLMRegio", "BFS Arealstatistik (NOAS04)", "Constant Value")
+_LUS_SOURCE_CODES = dict(zip(_LUS_SOURCE_CHOICES, ("tlm", "bfs", "constant")))
+_LUS_SOURCE_IDX = {code: i for i, code in enumerate(_LUS_SOURCE_CODES.values())}
+# Tab 6 summary labels (constant is shown with its PREVAH code)
+_LUS_SOURCE_LABELS = {"tlm": "SwissTLMRegio", "bfs": "BFS Arealstatistik"}
+
+# Land cover category mappings shown in tab 4
+TLM_PREVAH_MAPPING = {
+    "TLM Category": ("Wald", "Fels", "Geroell", "Gletscher", "See", "Stausee",
+                    "Siedl", "Stadtzentr", "Sumpf", "Obstanlage", "Reben"),
+    "PREVAH Code": (3, 15, 21, 14, 1, 1, 2, 2, 22, 18, 29),
+    "PREVAH Description": ("coniferous forest", "rock", "alpine vegetation", "bare ice",
+                          "water", "water", "settlement", "settlement", "wetlands",
+                          "fruit", "grapes")
+}
+
+LC27_PREVAH_MAPPING = {
+    "LC_27": tuple(range(1, 28)),
+    "Description": (
+        "Industrial buildings", "Commercial/services", "Residential",
+        "Agricultural buildings", "Unspecified buildings", "Transport areas",
+        "Special urban areas", "Recreation/green spaces", "Orchards", "Vineyards",
+        "Horticulture", "Arable land", "Meadows/pastures", "Alpine pastures",
+        "Dense forest", "Open forest", "Shrub forest", "Hedges/groves",
+        "Standing water", "Flowing water", "Unproductive vegetation",
+        "Bare ground", "Rock", "Sand/gravel", "Glacier/firn", "Wetlands",
+        "Other unproductive"
+    ),
+    "PREVAH": (2, 2, 2, 2, 2, 11, 2, 7, 18, 29, 19, 6, 7, 23,
+              5, 5, 8, 8, 1, 1, 21, 26, 15, 26, 14, 22, 27),
+    "PREVAH Name": (
+        "settlement", "settlement", "settlement", "settlement", "settlement", "road",
+        "settlement", "pasture", "fruit", "grapes", "vegetables", "cereals",
+        "pasture", "rough pasture", "mixed forest", "mixed forest", "bush", "bush",
+        "water", "water", "alpine vegetation", "bare soil vegetation", "rock",
+        "bare soil vegetation", "bare ice", "wetlands", "free"
+    )
+}
+
+# PREVAH land cover codes shown in the Other Locations land cover tab
+PREVAH_CODES = {
+    "Code": (1, 2, 3, 4, 5, 6, 7, 8, 11, 13, 14, 15, 18, 19, 20, 21, 22, 23, 24, 25, 26, 27, 28, 29),
+    "Description": (
+        "water", "settlement", "coniferous forest", "deciduous forest", "mixed forest",
+        "cereals", "pasture", "bush", "road", "firn", "bare ice", "rock", "fruit",
+        "vegetables", "wheat", "alpine vegetation", "wetlands", "rough pasture",
+        "subalpine meadow", "alpine meadow", "bare soil vegetation", "free", "corn", "grapes"
+    )
+}
+
+# Defaults for session config keys read across tabs (set once per session)
+CONFIG_DEFAULTS = {
+    'simu_name': '',
+    'use_shp': True,
+    'roi_shapefile': '',
+    'roi_size': 1000,
+    'poi_x': 645000,
+    'poi_y': 115000,
+    'poi_z': 1500,
+    'gsd': 10.0,
+    'gsd_ref': 2.0,
+    'mask_dem_to_polygon': True,
+    'mask_lus_to_polygon': True,
+    'lus_source': 'tlm',
+    'lus_cst': 11500,
+    'buffer_size': 10000,
+    'coord_sys': 'CH1903+',
+    'user_dem_path': '',
+    'target_epsg': 32632,
+    'a3d_working_dir': '',
+}
+
+# Saved configs and uploaded DEMs (relative to the app's working directory)
+CONFIG_DIR = Path("config")
+DEM_DIR = CONFIG_DIR / "dem"
+
+# Upper bound on shapefile dropdown entries (large option lists make the selectbox lag)
+MAX_SHAPEFILE_OPTIONS = 50
+
+# Run log view: poll interval and size of the tail shown while a run is in progress
+LOG_REFRESH_SECONDS = 0.5
+LOG_TAIL_LINES = 500
+LOG_TAIL_BYTES = 256 * 1024
 
 def find_shapefiles(base_dir):
     """
     Recursively find all .shp files in a directory.
 
+    Results are cached per directory and its mtime, so unchanged directories
+    are not walked again on every Streamlit rerun.
+
     Args:
         base_dir: Base directory to search (str or Path)
 
@@ -68,35 +186,247 @@ def find_shapefiles(base_dir):
     """
     try:
         base_path = Path(base_dir)
-        if not base_path.exists() or not base_path.is_dir():
+        if not base_path.is_dir():
             return []
 
-        # Find all .shp files recursively
-        shapefiles = sorted(base_path.rglob("*.shp"))
-        return shapefiles
+        # Find all .shp files recursively (cached on path + mtime)
+        shapefiles = _scan_shapefiles(str(base_path), base_path.stat().st_mtime)
+        return [Path(p) for p in shapefiles]
     except Exception:
         return []
 
-@st.cache_data(ttl=3600)
+# Simplified Swiss boundary (approximate), used when the Swisstopo API is unavailable.
+# This is a generalized version for validation purposes.
+# Coordinates in EPSG:2056 (Swiss LV95)
+_SIMPLIFIED_COORDS = (
+    (2485000, 1075000),  # SW corner
+    (2485000, 1110000),
+    (2490000, 1145000),  # West (Geneva area)
+    (2495000, 1185000),
+    (2510000, 1230000),
+    (2525000, 1265000),  # NW
+    (2570000, 1295000),  # North
+    (2630000, 1296000),
+    (2720000, 1295000),  # NE (Rhine valley)
+    (2795000, 1280000),
+    (2834000, 1255000),  # East (Grisons)
+    (2830000, 1220000),
+    (2815000, 1185000),
+    (2785000, 1150000),  # SE
+    (2750000, 1110000),
+    (2715000, 1085000),  # Ticino
+    (2680000, 1080000),
+    (2630000, 1085000),
+    (2580000, 1095000),
+    (2530000, 1085000),
+    (2490000, 1078000),  # South
+    (2485000, 1075000),  # Close polygon
+)
+_SWISS_FALLBACK_POLYGON = Polygon(_SIMPLIFIED_COORDS)
+
+@st.cache_resource(show_spinner=False)
+def get_transformer(crs_from, crs_to):
+    """
+    Get a shared (always_xy) pyproj Transformer between two CRS.
+
+    Building a Transformer is far costlier than using one, so each pair is
+    built once per process and reused across reruns and sessions.
+
+    Args:
+        crs_from: Source CRS (e.g. 'EPSG:2056')
+        crs_to: Target CRS (e.g. 'EPSG:4326')
+
+    Returns:
+        pyproj.Transformer
+    """
+    Transformer = importlib.import_module('pyproj').Transformer
+    return Transformer.from_crs(crs_from, crs_to, always_xy=True)
+
+class SwissBoundary(NamedTuple):
+    """Swiss boundary polygon together with its prepared (indexed) version."""
+    polygon: object        # shapely.Polygon, used for bounds and reprojection
+    prepared: object       # shapely PreparedGeometry, used for polygon covers()/intersects() queries
+    vertices: np.ndarray   # (N, 2) closed exterior ring, used for point/box ray-casts
+
+def _make_swiss_boundary(polygon):
+    """Bundle a boundary polygon with its prepared geometry and vertex array."""
+    return SwissBoundary(polygon, prep(polygon), np.asarray(polygon.exterior.coords, dtype=float))
+
+def points_in_polygon(xs, ys, vertices):
+    """
+    Vectorized even-odd ray-cast point-in-polygon test.
+
+    Args:
+        xs: X coordinate(s) of the point(s)
+        ys: Y coordinate(s) of the point(s)
+        vertices: (N, 2) array of the closed polygon ring
+
+    Returns:
+        numpy.ndarray: Boolean mask, True where a point lies inside the ring
+    """
+    xs = np.atleast_1d(np.asarray(xs, dtype=float))[:, None]
+    ys = np.atleast_1d(np.asarray(ys, dtype=float))[:, None]
+    x0, y0 = vertices[:-1, 0], vertices[:-1, 1]
+    x1, y1 = vertices[1:, 0], vertices[1:, 1]
+
+    # Edges straddling the horizontal ray cast from each point towards +x
+    straddles = (y0 > ys) != (y1 > ys)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_cross = x0 + (ys - y0) * (x1 - x0) / (y1 - y0)
+    crossings = np.count_nonzero(straddles & (xs < x_cross), axis=1)
+    return crossings % 2 == 1
+
+def segments_cross(segments_a, segments_b):
+    """
+    Check whether any segment of one set properly crosses any segment of another.
+
+    Args:
+        segments_a: (M, 2, 2) array of segments [[x0, y0], [x1, y1]]
+        segments_b: (K, 2, 2) array of segments
+
+    Returns:
+        bool: True if at least one pair of segments crosses
+    """
+    a0, a1 = segments_a[:, None, 0], segments_a[:, None, 1]
+    b0, b1 = segments_b[None, :, 0], segments_b[None, :, 1]
+
+    def orientation(p, q, r):
+        return (q[..., 0] - p[..., 0]) * (r[..., 1] - p[..., 1]) - (q[..., 1] - p[..., 1]) * (r[..., 0] - p[..., 0])
+
+    d1 = orientation(b0, b1, a0)
+    d2 = orientation(b0, b1, a1)
+    d3 = orientation(a0, a1, b0)
+    d4 = orientation(a0, a1, b1)
+    return bool(np.any((d1 * d2 < 0) & (d3 * d4 < 0)))
+
+def box_in_polygon(minx, miny, maxx, maxy, vertices):
+    """
+    Check whether an axis-aligned box lies inside a polygon ring.
+
+    The box is inside if its 4 corners are inside and none of its edges
+    crosses a ring edge, which avoids a general polygon-in-polygon test.
+
+    Args:
+        minx, miny, maxx, maxy: Box bounds (same CRS as vertices)
+        vertices: (N, 2) array of the closed polygon ring
+
+    Returns:
+        bool: True if the box is inside the ring
+    """
+    corners = np.array([
+        (minx, miny),
+        (maxx, miny),
+        (maxx, maxy),
+        (minx, maxy),
+        (minx, miny),
+    ])
+    if not points_in_polygon(corners[:-1, 0], corners[:-1, 1], vertices).all():
+        return False
+    box_edges = np.stack([corners[:-1], corners[1:]], axis=1)
+    ring_edges = np.stack([vertices[:-1], vertices[1:]], axis=1)
+    return not segments_cross(box_edges, ring_edges)
+
+@st.cache_resource(show_spinner=False)
+def _swisstopo_session():
+    """
+    Get the HTTP session shared by all Swisstopo API calls.
+
+    Cached as a resource so the connection pool (and its open TLS connections)
+    outlives a single script rerun and is shared across sessions. Transient
+    connection errors are retried twice with a short backoff.
+
+    Returns:
+        requests.Session with a small HTTPS keep-alive connection pool
+    """
+    session = requests.Session()
+    retries = Retry(total=2, backoff_factor=0.2)
+    session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=retries))
+    return session
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def fetch_height(x_q, y_q):
+    """
+    Fetch the terrain elevation of an LV95 point from the Swisstopo height service.
+
+    Callers round coordinates to whole meters, so repeated clicks on (nearly)
+    the same spot are served from the cache. Failures raise and are therefore
+    not cached.
+
+    Args:
+        x_q: Easting rounded to the meter (EPSG:2056)
+        y_q: Northing rounded to the meter (EPSG:2056)
+
+    Returns:
+        float: Elevation in meters
+
+    Raises:
+        requests.RequestException: If the request fails or returns an error status
+    """
+    height_url = f"https://api3.geo.admin.ch/rest/services/height?easting={x_q}&northing={y_q}&sr=2056"
+    response = _swisstopo_session().get(height_url, timeout=5)
+    response.raise_for_status()
+    return float(response.json()['height'])
+
+# On-disk copy of the Swisstopo boundary response (survives process restarts)
+_SWISS_BOUNDARY_CACHE_FILE = "swiss_boundary.geojson"
+_SWISS_BOUNDARY_CACHE_MAX_AGE = timedelta(days=30)
+
+def _write_swiss_boundary_cache(cache_file, rings):
+    """
+    Persist the boundary rings fetched from Swisstopo as a GeoJSON polygon.
+
+    The file is written to a temporary name and moved into place so that a
+    concurrent reader never sees a partial file. Failures are ignored: the
+    on-disk copy is only an optimization.
+
+    Args:
+        cache_file: Target path of the GeoJSON file
+        rings: Polygon rings in EPSG:2056 as returned by the REST API
+    """
+    tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_file, 'w') as f:
+            json.dump({'type': 'Polygon', 'coordinates': rings}, f)
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        tmp_file.unlink(missing_ok=True)
+
+@st.cache_resource(ttl=3600, show_spinner=False)
 def get_swiss_boundary_polygon():
     """
     Fetch or create Swiss boundary polygon for validation.
 
-    First attempts to fetch from Swisstopo REST API.
+    First reuses the copy persisted in the cache directory (if younger than
+    30 days), then attempts to fetch from Swisstopo REST API.
     Falls back to simplified boundary polygon if API unavailable.
+    The polygon is prepared once so repeated predicate queries reuse its index.
+
+    Cached as a shared resource (not pickled) so the prepared geometry survives
+    across sessions. The returned object is shared: callers must not mutate it.
 
     Returns:
-        shapely.Polygon: Swiss boundary in EPSG:2056, or None if all methods fail
+        SwissBoundary: (polygon, prepared, vertices) in EPSG:2056, or None if all methods fail
     """
     try:
-        import requests
-        from shapely.geometry import Polygon
+        # Reuse the boundary persisted by a previous process (instant cold start)
+        cache_file = get_cache_dir() / _SWISS_BOUNDARY_CACHE_FILE
+        try:
+            cache_age = datetime.now().timestamp() - cache_file.stat().st_mtime
+            if cache_age < _SWISS_BOUNDARY_CACHE_MAX_AGE.total_seconds():
+                with open(cache_file) as f:
+                    rings = json.load(f)['coordinates']
+                return _make_swiss_boundary(Polygon(rings[0]))
+        except (OSError, ValueError, KeyError, IndexError):
+            pass
 
         # Try Swisstopo REST API for height service (includes boundary query)
         # Alternative: Use a pre-simplified boundary polygon
         url = "https://api3.geo.admin.ch/rest/services/api/MapServer/identify?geometry=2660000,1185000&geometryType=esriGeometryPoint&layers=all:ch.swisstopo.swissboundaries3d-land-flaeche.fill&returnGeometry=true&sr=2056"
 
-        response = requests.get(url, timeout=5)
+        try:
+            response = _swisstopo_session().get(url, timeout=5)
+        except requests.RequestException:
+            return _make_swiss_boundary(_SWISS_FALLBACK_POLYGON)
 
         if response.status_code == 200:
             data = response.json()
@@ -107,49 +437,90 @@ def get_swiss_boundary_polygon():
                         rings = result['geometry']['rings']
                         if rings and len(rings) > 0:
                             # Create polygon from rings
-                            from shapely.geometry import Polygon
                             polygon = Polygon(rings[0])
-                            return polygon
+                            _write_swiss_boundary_cache(cache_file, rings)
+                            return _make_swiss_boundary(polygon)
 
         # Fallback: Use simplified Swiss boundary (approximate)
-        # This is a generalized version for validation purposes
-        # Coordinates in EPSG:2056 (Swiss LV95)
-        simplified_coords = [
-            (2485000, 1075000),  # SW corner
-            (2485000, 1110000),
-            (2490000, 1145000),  # West (Geneva area)
-            (2495000, 1185000),
-            (2510000, 1230000),
-            (2525000, 1265000),  # NW
-            (2570000, 1295000),  # North
-            (2630000, 1296000),
-            (2720000, 1295000),  # NE (Rhine valley)
-            (2795000, 1280000),
-            (2834000, 1255000),  # East (Grisons)
-            (2830000, 1220000),
-            (2815000, 1185000),
-            (2785000, 1150000),  # SE
-            (2750000, 1110000),
-            (2715000, 1085000),  # Ticino
-            (2680000, 1080000),
-            (2630000, 1085000),
-            (2580000, 1095000),
-            (2530000, 1085000),
-            (2490000, 1078000),  # South
-            (2485000, 1075000),  # Close polygon
-        ]
-
-        polygon = Polygon(simplified_coords)
-        return polygon
+        return _make_swiss_boundary(_SWISS_FALLBACK_POLYGON)
 
     except Exception:
         return None
 
+@st.cache_resource(ttl=3600, show_spinner=False)
+def get_swiss_boundary_polygon_wgs84():
+    """
+    Get the Swiss boundary polygon reprojected once to WGS84 (EPSG:4326).
+
+    Drawn ROIs come from the map as WGS84 GeoJSON, so validating them against
+    this version avoids reprojecting every drawn geometry. Edges are densified
+    before reprojection so the boundary shape is preserved.
+    The returned object is shared: callers must not mutate it.
+
+    Returns:
+        SwissBoundary: (polygon, prepared, vertices) in EPSG:4326, or None if unavailable
+    """
+    swiss_boundary = get_swiss_boundary_polygon()
+    if swiss_boundary is None:
+        return None
+
+    densified = shapely.segmentize(swiss_boundary.polygon, max_segment_length=1000)
+    return _make_swiss_boundary(shapely_transform(get_transformer('EPSG:2056', 'EPSG:4326').transform, densified))
+
+# Approximate Swiss bounding box (EPSG:2056): min_E, max_E, min_N, max_N
+_SWISS_BBOX = np.array([2485000, 2834000, 1075000, 1296000], dtype=float)
+# +1 where the value must be >= the limit, -1 where it must be <= the limit
+_SWISS_BBOX_SIGN = np.array([1, -1, 1, -1], dtype=float)
+
+def swiss_bbox_mask(min_e, max_e, min_n, max_n):
+    """
+    Compare LV95 bounds against the approximate Swiss bounding box.
+
+    Args:
+        min_e, max_e, min_n, max_n: Bounds to test (EPSG:2056)
+
+    Returns:
+        numpy.ndarray: 4 booleans (min_E, max_E, min_N, max_N), True where
+        the bound is within the Swiss bounding box
+    """
+    bounds = np.array([min_e, max_e, min_n, max_n], dtype=float)
+    return (bounds - _SWISS_BBOX) * _SWISS_BBOX_SIGN >= 0
+
+def _validate_once(roi_key, check, *args):
+    """
+    Run a boundary check only when the ROI differs from the last one checked.
+
+    The last (roi_key, result) pair is kept in session_state, so reruns that
+    do not change the ROI reuse the previous result. Results of checks that
+    could not run against the boundary polygon (fetch failure, error) are
+    not kept, so the next rerun tries again.
+
+    Args:
+        roi_key: Hashable description of the ROI being validated
+        check: Boundary check function returning (is_valid, message, checked)
+        *args: Arguments passed to check
+
+    Returns:
+        tuple: (is_valid: bool, message: str)
+    """
+    cached = st.session_state.get('_roi_valid_key')
+    if cached is not None and cached[0] == roi_key:
+        return cached[1]
+
+    is_valid, message, checked = check(*args)
+    result = (is_valid, message)
+    if checked:
+        st.session_state['_roi_valid_key'] = (roi_key, result)
+    else:
+        st.session_state.pop('_roi_valid_key', None)
+    return result
+
 def check_swiss_boundaries(x, y, roi_size=None):
     """
     Check if coordinates (and optional ROI) are within Swiss boundaries (EPSG:2056).
 
-    Uses official Swiss boundary polygon from Swisstopo.
+    Uses official Swiss boundary polygon from Swisstopo. The result is reused
+    until the point or ROI size changes.
 
     Args:
         x: Easting coordinate (EPSG:2056)
@@ -159,60 +530,59 @@ def check_swiss_boundaries(x, y, roi_size=None):
     Returns:
         tuple: (is_valid: bool, message: str)
     """
-    try:
-        from shapely.geometry import Point, box
+    return _validate_once(('bbox', x, y, roi_size), _check_swiss_boundaries, x, y, roi_size)
+
+def _check_swiss_boundaries(x, y, roi_size):
+    """
+    Uncached implementation of check_swiss_boundaries.
 
+    Returns:
+        tuple: (is_valid, message, checked) where checked is False when the
+        boundary polygon was unavailable or the check failed
+    """
+    try:
         # Get Swiss boundary polygon
         swiss_boundary = get_swiss_boundary_polygon()
 
         if swiss_boundary is None:
             # Fallback to bounding box check if API fails
-            SWISS_MIN_E = 2485000
-            SWISS_MAX_E = 2834000
-            SWISS_MIN_N = 1075000
-            SWISS_MAX_N = 1296000
-
-            if not (SWISS_MIN_E <= x <= SWISS_MAX_E and SWISS_MIN_N <= y <= SWISS_MAX_N):
-                return False, f"⚠️ Point ({x:.0f}, {y:.0f}) appears outside Swiss boundaries"
+            if not swiss_bbox_mask(x, x, y, y).all():
+                return False, f"⚠️ Point ({x:.0f}, {y:.0f}) appears outside Swiss boundaries", False
 
             if roi_size:
                 half_size = roi_size / 2
-                min_x, max_x = x - half_size, x + half_size
-                min_y, max_y = y - half_size, y + half_size
-
-                if not (SWISS_MIN_E <= min_x and max_x <= SWISS_MAX_E and
-                       SWISS_MIN_N <= min_y and max_y <= SWISS_MAX_N):
-                    return False, f"⚠️ ROI extends outside Swiss boundaries. Reduce ROI size or move center point."
+                if not swiss_bbox_mask(x - half_size, x + half_size, y - half_size, y + half_size).all():
+                    return False, f"⚠️ ROI extends outside Swiss boundaries. Reduce ROI size or move center point.", False
 
-            return True, "✅ Within Swiss boundaries"
+            return True, "✅ Within Swiss boundaries", False
 
-        # Use actual Swiss boundary polygon
-        point = Point(x, y)
+        # Use actual Swiss boundary polygon (vectorized ray-cast on its vertices)
+        vertices = swiss_boundary.vertices
 
         # Check if point is within Switzerland
-        if not swiss_boundary.contains(point):
-            return False, f"⚠️ Point ({x:.0f}, {y:.0f}) is outside Switzerland"
+        if not points_in_polygon(x, y, vertices)[0]:
+            return False, f"⚠️ Point ({x:.0f}, {y:.0f}) is outside Switzerland", True
 
         # If ROI size provided, check if entire bounding box fits within Switzerland
         if roi_size:
             half_size = roi_size / 2
-            roi_box = box(x - half_size, y - half_size, x + half_size, y + half_size)
+            # ROI box is fully within Switzerland if all corners are inside
+            # and no box edge crosses the boundary
+            if not box_in_polygon(x - half_size, y - half_size, x + half_size, y + half_size, vertices):
+                return False, f"⚠️ ROI extends outside Switzerland. Reduce ROI size or move center point.", True
 
-            # Check if ROI box is fully within Switzerland
-            if not swiss_boundary.contains(roi_box):
-                return False, f"⚠️ ROI extends outside Switzerland. Reduce ROI size or move center point."
-
-        return True, "✅ Within Switzerland"
+        return True, "✅ Within Switzerland", True
 
     except Exception:
         # If anything fails, allow it (better than blocking)
-        return True, "⚠️ Could not validate boundaries"
+        return True, "⚠️ Could not validate boundaries", False
 
 def check_polygon_in_swiss_boundaries(geojson_geometry):
     """
     Check if a drawn polygon is within Swiss boundaries.
 
-    Uses official Swiss boundary polygon from Swisstopo.
+    Uses official Swiss boundary polygon from Swisstopo. The result is reused
+    until a different polygon is drawn.
 
     Args:
         geojson_geometry: GeoJSON geometry object (in WGS84)
@@ -220,60 +590,118 @@ def check_polygon_in_swiss_boundaries(geojson_geometry):
     Returns:
         tuple: (is_valid: bool, message: str)
     """
-    try:
-        from shapely.geometry import shape as shapely_shape
-        import geopandas as gpd
+    roi_key = ('polygon', repr(geojson_geometry.get('coordinates')))
+    return _validate_once(roi_key, _check_polygon_in_swiss_boundaries, geojson_geometry)
 
-        # Convert GeoJSON to shapely geometry (WGS84)
-        geom_wgs84 = shapely_shape(geojson_geometry)
+def _check_polygon_in_swiss_boundaries(geojson_geometry):
+    """
+    Uncached implementation of check_polygon_in_swiss_boundaries.
 
-        # Transform to Swiss LV95
-        gdf = gpd.GeoDataFrame([{'geometry': geom_wgs84}], crs='EPSG:4326')
-        gdf_lv95 = gdf.to_crs('EPSG:2056')
-        geom_lv95 = gdf_lv95.geometry.iloc[0]
+    Returns:
+        tuple: (is_valid, message, checked) where checked is False when the
+        boundary polygon was unavailable or the check failed
+    """
+    try:
+        # Convert GeoJSON to shapely geometry (WGS84, the map's native CRS)
+        geom_wgs84 = shape(geojson_geometry)
+        minx, miny, maxx, maxy = geom_wgs84.bounds
 
-        # Get Swiss boundary polygon
-        swiss_boundary = get_swiss_boundary_polygon()
+        # Get Swiss boundary polygon (pre-transformed to WGS84, no per-call reprojection)
+        swiss_boundary = get_swiss_boundary_polygon_wgs84()
 
         if swiss_boundary is None:
-            # Fallback to bounding box check if polygon unavailable
-            SWISS_MIN_E = 2485000
-            SWISS_MAX_E = 2834000
-            SWISS_MIN_N = 1075000
-            SWISS_MAX_N = 1296000
+            # Fallback to bounding box check (LV95) if polygon unavailable
+            min_e, min_n, max_e, max_n = get_transformer('EPSG:4326', 'EPSG:2056').transform_bounds(minx, miny, maxx, maxy)
+            inside = swiss_bbox_mask(min_e, max_e, min_n, max_n)
+
+            if not inside[:2].all():
+                return False, f"⚠️ Drawn ROI extends outside Swiss boundaries (East-West). Please redraw within Switzerland.", False
+
+            if not inside[2:].all():
+                return False, f"⚠️ Drawn ROI extends outside Swiss boundaries (North-South). Please redraw within Switzerland.", False
 
-            minx, miny, maxx, maxy = geom_lv95.bounds
+            return True, "✅ ROI within Swiss boundaries (bounding box check)", False
 
-            if minx < SWISS_MIN_E or maxx > SWISS_MAX_E:
-                return False, f"⚠️ Drawn ROI extends outside Swiss boundaries (East-West). Please redraw within Switzerland."
+        # Cheap envelope test against the boundary's bounding box first: ROIs
+        # outside it can never be inside the boundary, so skip the full contains()
+        swiss_minx, swiss_miny, swiss_maxx, swiss_maxy = swiss_boundary.polygon.bounds
 
-            if miny < SWISS_MIN_N or maxy > SWISS_MAX_N:
-                return False, f"⚠️ Drawn ROI extends outside Swiss boundaries (North-South). Please redraw within Switzerland."
+        if minx < swiss_minx or maxx > swiss_maxx:
+            return False, f"⚠️ Drawn ROI extends outside Swiss boundaries (East-West). Please redraw within Switzerland.", True
 
-            return True, "✅ ROI within Swiss boundaries (bounding box check)"
+        if miny < swiss_miny or maxy > swiss_maxy:
+            return False, f"⚠️ Drawn ROI extends outside Swiss boundaries (North-South). Please redraw within Switzerland.", True
+
+        # Drawn rectangles (the most common case) are axis-aligned boxes:
+        # check corners and edge crossings instead of a full covers() test
+        is_rectangle = (
+            geom_wgs84.geom_type == 'Polygon'
+            and not geom_wgs84.interiors
+            and len(geom_wgs84.exterior.coords) == 5
+            and geom_wgs84.equals(geom_wgs84.envelope)
+        )
+        if is_rectangle:
+            is_covered = box_in_polygon(minx, miny, maxx, maxy, swiss_boundary.vertices)
+        else:
+            # Use actual Swiss boundary polygon
+            # Check if drawn geometry is fully within Switzerland
+            # Using .covers() checks if the ENTIRE geometry (including edges) is within the boundary
+            is_covered = swiss_boundary.prepared.covers(geom_wgs84)
 
-        # Use actual Swiss boundary polygon
-        # Check if drawn geometry is fully within Switzerland
-        # Using .contains() checks if the ENTIRE geometry (including edges) is within the boundary
-        if not swiss_boundary.contains(geom_lv95):
+        if not is_covered:
             # Additional check: does the drawn polygon intersect but not fully contained?
-            if swiss_boundary.intersects(geom_lv95):
-                return False, f"⚠️ Drawn ROI crosses Swiss border. Part of the ROI is outside Switzerland. Please redraw within Swiss borders."
+            # (reuses the same prepared index as the covers() test)
+            if swiss_boundary.prepared.intersects(geom_wgs84):
+                return False, f"⚠️ Drawn ROI crosses Swiss border. Part of the ROI is outside Switzerland. Please redraw within Swiss borders.", True
             else:
-                return False, f"⚠️ Drawn ROI is completely outside Switzerland. Please redraw within Swiss borders."
+                return False, f"⚠️ Drawn ROI is completely outside Switzerland. Please redraw within Swiss borders.", True
 
-        return True, "✅ ROI within Switzerland (boundary polygon check)"
+        return True, "✅ ROI within Switzerland (boundary polygon check)", True
 
     except Exception as e:
         # Log the error for debugging
-        import streamlit as st
         st.warning(f"⚠️ Boundary validation error: {str(e)}")
         # Fail safe: reject if validation fails
-        return False, f"❌ Could not validate boundaries (error: {str(e)}). Please check your ROI."
+        return False, f"❌ Could not validate boundaries (error: {str(e)}). Please check your ROI.", False
+
+# Static map configuration shared by all Swisstopo maps
+_SWISSTOPO_WMS_LAYER = {
+    'url': 'https://wms.geo.admin.ch/',
+    'layers': 'ch.swisstopo.pixelkarte-farbe',
+    'fmt': 'image/png',
+    'transparent': False,
+    'name': 'Swisstopo Map',
+    'overlay': False,
+    'control': True,
+    'attr': '© swisstopo',
+}
+_ROI_DRAW_OPTIONS = {
+    'polyline': False,
+    'rectangle': True,
+    'circle': False,
+    'marker': False,
+    'circlemarker': False,
+    'polygon': True
+}
+_ROI_EDIT_OPTIONS = {
+    'edit': True,
+    'remove': True
+}
+
+# Leaflet callback building a red POI marker from a [lat, lon, popup_html] row
+_POI_MARKER_CALLBACK = """
+var callback = function (row) {
+    var icon = L.AwesomeMarkers.icon({markerColor: 'red', icon: 'info-sign', prefix: 'glyphicon'});
+    return L.marker(new L.LatLng(row[0], row[1]), {icon: icon}).bindPopup(row[2]);
+};
+"""
 
-def create_roi_map(center_lat=46.8, center_lon=8.2, zoom=8):
+def create_swisstopo_map(center_lat=46.8, center_lon=8.2, zoom=8):
     """
-    Create an interactive map with Swisstopo layers for drawing ROI polygons.
+    Create a map with the Swisstopo national map (WMS) as base layer.
+
+    A fresh map is built per call: st_folium rewrites element ids while
+    rendering, so folium.Map objects must not be cached and re-rendered.
 
     Args:
         center_lat: Latitude for map center (WGS84)
@@ -281,44 +709,44 @@ def create_roi_map(center_lat=46.8, center_lon=8.2, zoom=8):
         zoom: Initial zoom level
 
     Returns:
-        folium.Map object with drawing tools
+        folium.Map object
     """
-    # Create base map centered on Switzerland
+    folium = importlib.import_module('folium')
+
+    # Create base map (custom tiles only)
     m = folium.Map(
         location=[center_lat, center_lon],
         zoom_start=zoom,
-        tiles=None  # We'll add custom tiles
+        tiles=None
     )
 
     # Add Swisstopo base layer (Swiss National Map)
-    folium.raster_layers.WmsTileLayer(
-        url='https://wms.geo.admin.ch/',
-        layers='ch.swisstopo.pixelkarte-farbe',
-        fmt='image/png',
-        transparent=False,
-        name='Swisstopo Map',
-        overlay=False,
-        control=True,
-        attr='© swisstopo'
-    ).add_to(m)
+    folium.raster_layers.WmsTileLayer(**_SWISSTOPO_WMS_LAYER).add_to(m)
+
+    return m
+
+def create_roi_map(center_lat=46.8, center_lon=8.2, zoom=8):
+    """
+    Create an interactive map with Swisstopo layers for drawing ROI polygons.
+
+    Args:
+        center_lat: Latitude for map center (WGS84)
+        center_lon: Longitude for map center (WGS84)
+        zoom: Initial zoom level
+
+    Returns:
+        folium.Map object with drawing tools
+    """
+    # Create base map centered on Switzerland
+    m = create_swisstopo_map(center_lat, center_lon, zoom)
 
     # Add drawing tools (rectangle and polygon)
-    draw = Draw(
+    Draw = importlib.import_module('folium.plugins').Draw
+    Draw(
         export=False,
-        draw_options={
-            'polyline': False,
-            'rectangle': True,
-            'circle': False,
-            'marker': False,
-            'circlemarker': False,
-            'polygon': True
-        },
-        edit_options={
-            'edit': True,
-            'remove': True
-        }
-    )
-    draw.add_to(m)
+        draw_options=_ROI_DRAW_OPTIONS,
+        edit_options=_ROI_EDIT_OPTIONS
+    ).add_to(m)
 
     return m
 
@@ -337,24 +765,548 @@ def save_drawn_roi(geojson_data, output_path):
         # Extract geometry from GeoJSON
         geom = shape(geojson_data['geometry'])
 
-        # Create GeoDataFrame in WGS84
-        gdf = gpd.GeoDataFrame([{'id': 1}], geometry=[geom], crs='EPSG:4326')
+        # Transform to Swiss coordinate system (LV95) with the shared transformer
+        geom_lv95 = shapely_transform(get_transformer('EPSG:4326', 'EPSG:2056').transform, geom)
+
+        # Ensure output directory exists
+        output_dir = Path(output_path).parent
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        # Save as shapefile (single feature, written directly without a GeoDataFrame)
+        write_ogr = importlib.import_module('pyogrio.raw').write
+        write_ogr(
+            str(output_path),
+            geometry=np.array([shapely.to_wkb(geom_lv95)], dtype=object),
+            field_data=[np.array([1], dtype=np.int32)],
+            fields=['id'],
+            crs='EPSG:2056',
+            driver='ESRI Shapefile',
+            geometry_type=geom_lv95.geom_type
+        )
+
+        return True, f"✅ ROI saved successfully to {output_path}"
+
+    except Exception as e:
+        return False, f"❌ Error saving ROI: {str(e)}"
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _list_configs(config_dir, dir_mtime):
+    """
+    List the .ini config files available in a directory.
+
+    Args:
+        config_dir: Directory holding the configs (str)
+        dir_mtime: Modification time of config_dir, only used to invalidate the cache
+
+    Returns:
+        list: Sorted config file names (plain strings)
+    """
+    return sorted(p.name for p in Path(config_dir).glob("*.ini"))
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _scan_dems(dem_dir, dir_mtime):
+    """
+    List the GeoTIFF DEM files available in a directory, in a single scandir pass.
+
+    Args:
+        dem_dir: Directory holding the DEMs (str)
+        dir_mtime: Modification time of dem_dir, only used to invalidate the cache
+
+    Returns:
+        list: Sorted (file name, size in bytes) tuples
+    """
+    with os.scandir(dem_dir) as entries:
+        return sorted(
+            (entry.name, entry.stat().st_size)
+            for entry in entries
+            if entry.is_file() and os.path.splitext(entry.name)[1] in ('.tif', '.tiff')
+        )
+
+def init_config():
+    """
+    Create the session config dict and fill in missing CONFIG_DEFAULTS keys.
+
+    Keys already set (by the user or a loaded .ini) are left untouched, so
+    tabs can read st.session_state.config[key] directly.
+
+    Returns:
+        dict: The session config
+    """
+    config = st.session_state.setdefault('config', {})
+    for key, value in CONFIG_DEFAULTS.items():
+        config.setdefault(key, value)
+    return config
+
+def start_run(cmd, log_path):
+    """
+    Start an A3Dshell CLI run in the background.
+
+    The child writes straight to log_path, so the run survives app reruns and
+    the log can be tailed from a fragment without holding the script thread.
+
+    Args:
+        cmd: Command line to execute
+        log_path: Path of the log file receiving stdout and stderr
+
+    Returns:
+        subprocess.Popen: The running process
+    """
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(log_path, 'wb') as log_file:
+        return subprocess.Popen(cmd, stdout=log_file, stderr=subprocess.STDOUT)
+
+def read_log_tail(log_path, max_lines=LOG_TAIL_LINES):
+    """
+    Read the last lines of a run log.
+
+    Only the last LOG_TAIL_BYTES of the file are read and decoded, so the cost
+    does not grow with the length of the run.
+
+    Args:
+        log_path: Path of the log file
+        max_lines: Maximum number of lines to return
+
+    Returns:
+        str: The log tail ('' if the file cannot be read)
+    """
+    try:
+        with open(log_path, 'rb') as f:
+            size = f.seek(0, os.SEEK_END)
+            f.seek(max(size - LOG_TAIL_BYTES, 0))
+            data = f.read()
+    except OSError:
+        return ''
+    lines = data.decode('utf-8', errors='replace').splitlines()
+    if size > LOG_TAIL_BYTES:
+        lines = lines[1:]  # First line is cut off
+    return '\n'.join(lines[-max_lines:])
+
+def run_log_view(run):
+    """
+    Show the log tail of a background run.
+
+    Used as a fragment body polling every LOG_REFRESH_SECONDS, so log updates
+    only redraw this container. Detecting the end of the run is left to the
+    watch_runs() fragment.
+
+    Args:
+        run: Run record stored in st.session_state (see start_run)
+    """
+    with st.container(height=400):
+        st.code(read_log_tail(run['log_path']), language="text")
+
+def watch_runs(runs):
+    """
+    Rerun the whole app as soon as one of the given background runs exits.
+
+    Args:
+        runs: Run records stored in st.session_state (see start_run)
+    """
+    if any(run['returncode'] is None and run['process'].poll() is not None for run in runs):
+        st.rerun()
+
+def collect_run(key):
+    """
+    Record the exit status of a background run once its process has exited.
+
+    Called on every full rerun before the tabs are built, so a finished run
+    is noticed (and its temp config removed) whichever tab is open. The
+    Popen object is released once its exit status has been collected.
+
+    Args:
+        key: st.session_state key of the run record (see start_run)
+
+    Returns:
+        dict or None: The run record if it finished since the last rerun
+    """
+    run = st.session_state.get(key)
+    if run is None or run['returncode'] is not None:
+        return None
+    returncode = run['process'].poll()
+    if returncode is None:
+        return None
+    run['returncode'] = returncode
+    del run['process']
+    run['temp_config'].unlink(missing_ok=True)
+    return run
+
+def update_config(values):
+    """
+    Apply GUI settings to st.session_state.config in one batched update.
+
+    Only keys whose value actually changed are written, so reruns with
+    unchanged inputs leave the config untouched.
+
+    Args:
+        values: dict of config keys and their new values
+
+    Returns:
+        bool: True if the config was modified
+    """
+    config = st.session_state.config
+    changed = {key: value for key, value in values.items() if config.get(key) != value}
+    if changed:
+        config.update(changed)
+    return bool(changed)
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def build_ini(simu_name, start_dt, end_dt, poi_x, poi_y, poi_z,
+              use_shapefile, roi_shapefile, roi_size, buffer_size, coord_sys,
+              gsd, gsd_ref, mask_dem, mask_lus, lus_source, lus_constant):
+    """
+    Render the fixed sections of a Switzerland-mode A3Dshell .ini config.
+
+    The header comment and the [POIS] section are written by write_ini(), so
+    identical settings (e.g. Save then Start Run) hit the cache.
+
+    Args:
+        simu_name: Simulation name
+        start_dt, end_dt: Simulation period (datetime)
+        poi_x, poi_y, poi_z: Main POI in EPSG:2056 and LV95 altitude
+        use_shapefile: Whether the ROI comes from a shapefile
+        roi_shapefile: Path to the ROI shapefile (used if use_shapefile)
+        roi_size: Bbox ROI size in meters (used otherwise)
+        buffer_size: Buffer size in meters
+        coord_sys: Output coordinate system
+        gsd, gsd_ref: Output grid spacing and reference DEM resolution
+        mask_dem, mask_lus: Whether DEM/LUS are masked to the ROI polygon
+        lus_source: Land use source ('tlm', 'bfs' or 'constant')
+        lus_constant: PREVAH land use code (used if lus_source is 'constant')
+
+    Returns:
+        str: The [GENERAL] to [A3D] sections
+    """
+    roi_line = f"ROI_SHAPEFILE = {roi_shapefile}" if use_shapefile else f"ROI = {roi_size}"
+    lus_cst_line = f"LUS_PREVAH_CST = {lus_constant}\n" if lus_source == "constant" else ""
+
+    return f"""[GENERAL]
+SIMULATION_NAME = {simu_name}
+START_DATE = {start_dt.isoformat(timespec='seconds')}
+END_DATE = {end_dt.isoformat(timespec='seconds')}
+
+[INPUT]
+EAST_epsg2056 = {poi_x}
+NORTH_epsg2056 = {poi_y}
+altLV95 = {poi_z}
+USE_SHP_ROI = {'true' if use_shapefile else 'false'}
+{roi_line}
+BUFFERSIZE = {buffer_size}
+
+[OUTPUT]
+OUT_COORDSYS = {coord_sys}
+GSD = {gsd}
+GSD_ref = {gsd_ref}
+DEM_ADDFMTLIST =
+MESH_FMT = vtu
+MASK_DEM_TO_POLYGON = {'true' if mask_dem else 'false'}
+MASK_LUS_TO_POLYGON = {'true' if mask_lus else 'false'}
+
+[MAPS]
+PLOT_HORIZON = false
+
+[A3D]
+USE_GROUNDEYE = false
+LUS_SOURCE = {lus_source}
+{lus_cst_line}DO_PVP_3D = false
+PVP_3D_FMT = vtu
+SP_BIN_PATH = snowpack
+"""
+
+def write_ini(path, header, pois, *settings):
+    """
+    Write a Switzerland-mode A3Dshell .ini config (UTF-8) in a single write.
+
+    Args:
+        path: Destination .ini file (Path)
+        header: Comment line(s) written at the top of the file
+        pois: List of POI dicts with name, x, y and z (may be empty)
+        *settings: Positional arguments of build_ini()
+    """
+    parts = [f"{header}\n\n", build_ini(*settings)]
+    if pois:
+        parts.append("\n[POIS]\n")
+        parts.extend(f"{poi['name']} = {poi['x']},{poi['y']},{poi['z']}\n" for poi in pois)
+    path.write_text("".join(parts), encoding="utf-8")
+
+@st.cache_resource
+def _other_locations_template():
+    """
+    Parse the Other Locations .ini template once per process.
+
+    Returns:
+        configparser.ConfigParser: The parsed template (treat as read-only)
+    """
+    parser = configparser.ConfigParser(delimiters="=", interpolation=None)
+    parser.optionxform = str
+    parser.read_string(get_template('otherLocations.ini'))
+    return parser
+
+def write_other_locations_ini(path, header, values, pois):
+    """
+    Write an Other Locations A3Dshell .ini config (UTF-8) from the cached template.
+
+    Args:
+        path: Destination .ini file
+        header: Comment line(s) written at the top of the file
+        values: Dict of {section: {key: value}} set on top of the template
+        pois: List of POI dicts with name, x, y and z (may be empty)
+    """
+    parser = configparser.ConfigParser(delimiters="=", interpolation=None)
+    parser.optionxform = str
+    parser.read_dict(_other_locations_template())
+    parser.read_dict(values)
+
+    buf = io.StringIO()
+    parser.write(buf)
+    # One line per POI, as in write_ini() (a parser section would merge POIs sharing a name)
+    if pois:
+        buf.write("[POIS]\n")
+        buf.writelines(f"{poi['name']} = {poi['x']},{poi['y']},{poi['z']}\n" for poi in pois)
+    path.write_text(f"{header}\n\n{buf.getvalue()}", encoding="utf-8")
+
+def _dem_settings_block(key_suffix, show_masks=True, side_by_side=False):
+    """
+    Render the DEM settings inputs shared by the three ROI modes of tab 2.
+
+    The LUS/DEM polygon masking choices are written to the session config.
+
+    Args:
+        key_suffix: Suffix keeping widget keys unique per ROI mode
+        show_masks: Whether to show the polygon masking checkboxes
+        side_by_side: Place resolution and grid spacing in two columns
+
+    Returns:
+        tuple: (gsd_ref, gsd, mask_lus, mask_dem); masks are None if not shown
+    """
+    ref_col, gsd_col = st.columns(2) if side_by_side else (nullcontext(), nullcontext())
+
+    with ref_col:
+        gsd_ref = st.selectbox(
+            "Reference DEM Resolution",
+            _GSD_REF_CHOICES,
+            index=_GSD_REF_IDX.get(float(st.session_state.config['gsd_ref']), 0),
+            help="Source DEM resolution from Swisstopo",
+            key=f"gsd_ref{key_suffix}"
+        )
+
+    with gsd_col:
+        gsd = st.number_input(
+            "Output Grid Spacing - meters",
+            value=max(float(st.session_state.config['gsd']), gsd_ref),
+            min_value=gsd_ref,
+            max_value=100.0,
+            step=1.0,
+            help="Output resolution (smaller = higher resolution, longer processing). Must be >= reference DEM resolution.",
+            key=f"gsd{key_suffix}"
+        )
+
+    if not show_masks:
+        return gsd_ref, gsd, None, None
+
+    mask_lus = st.checkbox(
+        "Mask LUS to polygon shape",
+        value=True,
+        help="If checked, LUS (land use surface) is cropped to polygon. "
+             "If unchecked, LUS covers entire bounding box. "
+             "Note: Grid extent is always the bounding box.",
+        key=f"mask_lus_checkbox{key_suffix}"
+    )
+
+    mask_dem = st.checkbox(
+        "Mask DEM to polygon shape",
+        value=mask_lus,  # Default to same as LUS
+        disabled=not mask_lus,  # Can only enable if LUS is masked
+        help="If checked, DEM is cropped to polygon (values outside = nodata). "
+             "If unchecked, DEM covers entire bounding box with all valid values. "
+             "Note: Grid extent is always the bounding box. "
+             "Cannot be checked if LUS masking is disabled.",
+        key=f"mask_dem_checkbox{key_suffix}"
+    )
+    # DEM can only be masked if LUS is also masked
+    update_config({
+        'mask_lus_to_polygon': mask_lus,
+        'mask_dem_to_polygon': mask_dem if mask_lus else False
+    })
+
+    return gsd_ref, gsd, mask_lus, mask_dem
+
+def parse_iso(value, default):
+    """
+    Parse an ISO 8601 date string (e.g. '2023-10-01T00:00:00').
+
+    Args:
+        value: Date string from the config (may be empty or None)
+        default: datetime returned when value is empty or invalid
+
+    Returns:
+        datetime: Parsed date, or default
+    """
+    if not value:
+        return default
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return default
+
+@st.cache_data(show_spinner=False)
+def load_roi_shapefile(path, mtime):
+    """
+    Load an ROI shapefile once and keep only what the POI tab needs.
+
+    Args:
+        path: Path to the shapefile (str)
+        mtime: Modification time of the file, only used to invalidate the cache
+
+    Returns:
+        dict: 'bounds' (minx, miny, maxx, maxy) and 'polygon_wkb' (union of
+        all features) in EPSG:2056, and 'geojson_wgs84' for map display
+    """
+    gpd = importlib.import_module('geopandas')
+    roi_gdf = gpd.read_file(path)
+    if roi_gdf.crs and roi_gdf.crs.to_epsg() != 2056:
+        roi_gdf = roi_gdf.to_crs("EPSG:2056")
+
+    return {
+        'bounds': tuple(roi_gdf.total_bounds),
+        'polygon_wkb': roi_gdf.union_all().wkb,
+        'geojson_wgs84': roi_gdf.to_crs("EPSG:4326").to_json()
+    }
+
+@st.cache_resource(show_spinner=False)
+def load_roi_polygon(path, mtime):
+    """
+    Get the ROI shapefile polygon prepared for repeated containment tests.
+
+    The prepared polygon is shared across reruns (and sessions) until the
+    shapefile changes, so its edge index is only built once.
+    The returned object is shared: callers must not mutate it.
+
+    Args:
+        path: Path to the shapefile (str)
+        mtime: Modification time of the file, only used to invalidate the cache
+
+    Returns:
+        shapely.Polygon (or MultiPolygon) in EPSG:2056, prepared in place
+    """
+    polygon = shapely.from_wkb(load_roi_shapefile(path, mtime)['polygon_wkb'])
+    shapely.prepare(polygon)
+    return polygon
+
+def read_file_on_click(path):
+    """
+    Build a st.download_button data callable that reads a file when clicked.
+
+    The file is not read (nor sent to the browser) on reruns, only when the
+    user actually downloads it.
+
+    Args:
+        path: Path to the file (str or Path)
+
+    Returns:
+        callable: Returns the file content as bytes (b'' if it cannot be read)
+    """
+    def read():
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except OSError:
+            return b''
+    return read
+
+@st.cache_data(show_spinner=False)
+def _load_template(name, override_mtime):
+    """
+    Load an INI template once per process (embedded, or its override file).
+
+    Args:
+        name: Template name (e.g. 'spConfig.ini')
+        override_mtime: Modification time of input/templates/<name>, or None
+            if there is no override; only used to invalidate the cache
+
+    Returns:
+        str: Template content
+
+    Raises:
+        KeyError: If the template does not exist
+    """
+    return get_template(name)
+
+def load_template(name, missing):
+    """
+    Get an INI template, falling back to a placeholder if it does not exist.
+
+    Args:
+        name: Template name (e.g. 'spConfig.ini')
+        missing: Content returned when the template is not found
+
+    Returns:
+        str: Template content
+    """
+    try:
+        override_mtime = (Path('input/templates') / name).stat().st_mtime
+    except OSError:
+        override_mtime = None
+    try:
+        return _load_template(name, override_mtime)
+    except KeyError:
+        return missing
+
+@st.cache_data(show_spinner=False)
+def load_config(path, mtime):
+    """
+    Parse an existing A3Dshell .ini config into a plain dict of GUI settings.
+
+    Args:
+        path: Path to the .ini file (str)
+        mtime: Modification time of the file, only used to invalidate the cache
+
+    Returns:
+        dict: Settings read from the GENERAL, INPUT, OUTPUT and A3D sections
+    """
+    parser = configparser.ConfigParser(inline_comment_prefixes=("#",))
+    parser.read(path)
+    config = {}
+
+    if "GENERAL" in parser:
+        config['simu_name'] = parser.get("GENERAL", "SIMULATION_NAME", fallback="")
+        config['start_date'] = parser.get("GENERAL", "START_DATE", fallback="")
+        config['end_date'] = parser.get("GENERAL", "END_DATE", fallback="")
 
-        # Transform to Swiss coordinate system (LV95)
-        gdf = gdf.to_crs('EPSG:2056')
+    if "INPUT" in parser:
+        config['poi_x'] = parser.get("INPUT", "EAST_epsg2056", fallback="")
+        config['poi_y'] = parser.get("INPUT", "NORTH_epsg2056", fallback="")
+        config['poi_z'] = parser.get("INPUT", "altLV95", fallback="")
+        config['use_shp'] = parser.getboolean("INPUT", "USE_SHP_ROI", fallback=False)
+        config['roi_size'] = parser.get("INPUT", "ROI", fallback="1000")
+        config['buffer_size'] = parser.get("INPUT", "BUFFERSIZE", fallback="50000")
+        config['roi_shapefile'] = parser.get("INPUT", "ROI_SHAPEFILE", fallback="")
 
-        # Ensure output directory exists
-        output_dir = Path(output_path).parent
-        output_dir.mkdir(parents=True, exist_ok=True)
+    if "OUTPUT" in parser:
+        config['coord_sys'] = parser.get("OUTPUT", "OUT_COORDSYS", fallback="CH1903+")
+        config['gsd'] = parser.get("OUTPUT", "GSD", fallback="10.0")
+        config['gsd_ref'] = parser.get("OUTPUT", "GSD_ref", fallback="2.0")
 
-        # Save as shapefile
-        gdf.to_file(output_path)
+    if "A3D" in parser:
+        # LUS source: support both new LUS_SOURCE and old USE_LUS_TLM formats
+        if "LUS_SOURCE" in parser["A3D"]:
+            config['lus_source'] = parser.get("A3D", "LUS_SOURCE", fallback="tlm")
+        elif "USE_LUS_TLM" in parser["A3D"]:
+            use_tlm = parser.getboolean("A3D", "USE_LUS_TLM", fallback=False)
+            config['lus_source'] = "tlm" if use_tlm else "constant"
+        else:
+            config['lus_source'] = "tlm"
+        config['lus_cst'] = parser.get("A3D", "LUS_PREVAH_CST", fallback="11500")
 
-        return True, f"✅ ROI saved successfully to {output_path}"
+    return config
 
-    except Exception as e:
-        return False, f"❌ Error saving ROI: {str(e)}"
+@st.cache_resource(show_spinner=False)
+def _ensure_dirs():
+    """
+    Create the config and uploaded DEM directories once per process.
+    """
+    DEM_DIR.mkdir(parents=True, exist_ok=True)
 
+_ensure_dirs()
 
 # Title
 st.title("A3Dshell")
@@ -362,9 +1314,8 @@ st.markdown("Configure Alpine3D simulation setups")
 
 # Sidebar for existing configs
 st.sidebar.header("Load Existing Config")
-config_dir = Path("config")
-existing_configs = list(config_dir.glob("*.ini"))
-config_names = ["Create New"] + [c.name for c in existing_configs]
+config_dir_mtime = CONFIG_DIR.stat().st_mtime if CONFIG_DIR.is_dir() else 0.0
+config_names = ["Create New"] + _list_configs(str(CONFIG_DIR), config_dir_mtime)
 
 selected_config = st.sidebar.selectbox(
     "Select configuration:",
@@ -394,49 +1345,40 @@ st.sidebar.markdown("""
 """, unsafe_allow_html=True)
 
 # Initialize session state
-if 'config' not in st.session_state:
-    st.session_state.config = {}
+init_config()
 
 # Initialize ROI validation state
 if 'roi_validated' not in st.session_state:
     st.session_state['roi_validated'] = False
 
-# Load selected config
+# Load selected config (only when the selection or the file itself changed)
 if selected_config != "Create New":
-    config_path = config_dir / selected_config
-    parser = configparser.ConfigParser(inline_comment_prefixes=("#",))
-    parser.read(config_path)
-
-    # Parse config into session state
-    if "GENERAL" in parser:
-        st.session_state.config['simu_name'] = parser.get("GENERAL", "SIMULATION_NAME", fallback="")
-        st.session_state.config['start_date'] = parser.get("GENERAL", "START_DATE", fallback="")
-        st.session_state.config['end_date'] = parser.get("GENERAL", "END_DATE", fallback="")
-
-    if "INPUT" in parser:
-        st.session_state.config['poi_x'] = parser.get("INPUT", "EAST_epsg2056", fallback="")
-        st.session_state.config['poi_y'] = parser.get("INPUT", "NORTH_epsg2056", fallback="")
-        st.session_state.config['poi_z'] = parser.get("INPUT", "altLV95", fallback="")
-        st.session_state.config['use_shp'] = parser.getboolean("INPUT", "USE_SHP_ROI", fallback=False)
-        st.session_state.config['roi_size'] = parser.get("INPUT", "ROI", fallback="1000")
-        st.session_state.config['buffer_size'] = parser.get("INPUT", "BUFFERSIZE", fallback="50000")
-        st.session_state.config['roi_shapefile'] = parser.get("INPUT", "ROI_SHAPEFILE", fallback="")
-
-    if "OUTPUT" in parser:
-        st.session_state.config['coord_sys'] = parser.get("OUTPUT", "OUT_COORDSYS", fallback="CH1903+")
-        st.session_state.config['gsd'] = parser.get("OUTPUT", "GSD", fallback="10.0")
-        st.session_state.config['gsd_ref'] = parser.get("OUTPUT", "GSD_ref", fallback="2.0")
-
-    if "A3D" in parser:
-        # LUS source: support both new LUS_SOURCE and old USE_LUS_TLM formats
-        if "LUS_SOURCE" in parser["A3D"]:
-            st.session_state.config['lus_source'] = parser.get("A3D", "LUS_SOURCE", fallback="tlm")
-        elif "USE_LUS_TLM" in parser["A3D"]:
-            use_tlm = parser.getboolean("A3D", "USE_LUS_TLM", fallback=False)
-            st.session_state.config['lus_source'] = "tlm" if use_tlm else "constant"
+    config_path = CONFIG_DIR / selected_config
+    config_key = (selected_config, os.path.getmtime(config_path))
+    if st.session_state.get('_loaded_config') != config_key:
+        st.session_state.config.update(load_config(str(config_path), config_key[1]))
+        st.session_state['_loaded_config'] = config_key
+else:
+    st.session_state.pop('_loaded_config', None)
+
+# Background runs: record finished ones here rather than in the tab bodies,
+# which may be skipped (tab 6 is only built while it is open)
+swiss_run_done = collect_run('swiss_run')
+if swiss_run_done and swiss_run_done['returncode'] == 0:
+    st.snow()
+    output_dir = Path("output") / swiss_run_done['simu_name']
+    if output_dir.exists():
+        swiss_run_done['output_dir'] = output_dir
+        # Set working directory for Run A3D tab
+        st.session_state.config['a3d_working_dir'] = str(output_dir)
+
+        # Offer download of the ZIP file produced by the CLI (tab 6)
+        zip_path = Path("output") / f"{swiss_run_done['simu_name']}.zip"
+        if zip_path.exists():
+            st.session_state['last_run_zip'] = str(zip_path)
         else:
-            st.session_state.config['lus_source'] = "tlm"
-        st.session_state.config['lus_cst'] = parser.get("A3D", "LUS_PREVAH_CST", fallback="11500")
+            swiss_run_done['missing_zip'] = zip_path
+collect_run('other_run')
 
 # Parent tabs for Switzerland vs Other Locations
 mode_tab_switzerland, mode_tab_other = st.tabs(["Switzerland", "Other Locations"])
@@ -448,49 +1390,57 @@ with mode_tab_switzerland:
     st.info("ℹ️ **Switzerland Mode**: Automatic DEM download from Swisstopo, IMIS station data via MeteoIO, and Snowpack preprocessing")
 
     # Tabs for configuration sections
-    tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs(["1.General", "2.ROI/DEM", "3.POI", "4.Landcover", "5.Meteo", "6.Run Config", "7.Run A3D"])
+    # Track the selected tab (switching reruns the app) so tabs can skip work when hidden
+    tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs(
+        ["1.General", "2.ROI/DEM", "3.POI", "4.Landcover", "5.Meteo", "6.Run Config", "7.Run A3D"],
+        key="switzerland_tab",
+        on_change="rerun"
+    )
 
     # ============================================================
     # Tab 1: General Settings
     # ============================================================
     with tab1:
         st.header("General Settings")
-    
-        col1, col2 = st.columns(2)
-    
-        with col1:
-            simu_name = st.text_input(
-                "Simulation Name",
-                value=st.session_state.config.get('simu_name', ''),
-                help="Unique name for this simulation (no spaces)"
-            )
-    
-        st.subheader("Simulation Period")
-        col1, col2 = st.columns(2)
-    
+
         # Parse dates from config or use defaults
         default_start = datetime(2023, 10, 1)
         default_end = datetime(2023, 10, 31, 23, 59, 59)
+
+        default_start = parse_iso(st.session_state.config.get('start_date'), default_start)
+        default_end = parse_iso(st.session_state.config.get('end_date'), default_end)
+
+        # Inputs are batched in a form: edits only trigger a rerun on "Apply"
+        with st.form("general_settings"):
+            col1, col2 = st.columns(2)
     
-        if st.session_state.config.get('start_date'):
-            try:
-                default_start = datetime.fromisoformat(st.session_state.config['start_date'].replace('T', ' '))
-            except:
-                pass
+            with col1:
+                simu_name = st.text_input(
+                    "Simulation Name",
+                    value=st.session_state.config['simu_name'],
+                    help="Unique name for this simulation (no spaces)"
+                )
     
-        if st.session_state.config.get('end_date'):
-            try:
-                default_end = datetime.fromisoformat(st.session_state.config['end_date'].replace('T', ' '))
-            except:
-                pass
+            st.subheader("Simulation Period")
+            col1, col2 = st.columns(2)
     
-        with col1:
-            start_date = st.date_input("Start Date", value=default_start)
-            start_time = st.time_input("Start Time", value=default_start.time())
+            with col1:
+                start_date = st.date_input("Start Date", value=default_start)
+                start_time = st.time_input("Start Time", value=default_start.time())
     
-        with col2:
-            end_date = st.date_input("End Date", value=default_end)
-            end_time = st.time_input("End Time", value=default_end.time())
+            with col2:
+                end_date = st.date_input("End Date", value=default_end)
+                end_time = st.time_input("End Time", value=default_end.time())
+
+            general_submitted = st.form_submit_button("Apply", type="primary")
+
+        if general_submitted:
+            update_config({
+                'simu_name': simu_name,
+                'start_date': datetime.combine(start_date, start_time).isoformat(timespec='seconds'),
+                'end_date': datetime.combine(end_date, end_time).isoformat(timespec='seconds')
+            })
+        st.caption("Click **Apply** after editing the general settings.")
     
         st.divider()
         st.info("Continue to the next tab: **2. ROI/DEM**")
@@ -502,12 +1452,12 @@ with mode_tab_switzerland:
         st.header("Region of Interest (ROI)")
 
         # Initialize DEM settings variables (will be set by widgets below)
-        gsd = float(st.session_state.config.get('gsd', 10.0))
-        gsd_ref = float(st.session_state.config.get('gsd_ref', 2.0))
+        gsd = float(st.session_state.config['gsd'])
+        gsd_ref = float(st.session_state.config['gsd_ref'])
 
         use_shapefile = st.checkbox(
             "Use custom shapefile for ROI",
-            value=st.session_state.config.get('use_shp', True)
+            value=st.session_state.config['use_shp']
         )
     
         if use_shapefile:
@@ -534,14 +1484,22 @@ with mode_tab_switzerland:
                             value="config/",
                             help="Directory to search for shapefiles (must be in a mounted volume)"
                         )
+                        # Directory scans are cached (60 s); allow forcing a rescan
+                        if st.button("🔄 Refresh", key="refresh_shapefiles", help="Rescan the directory for shapefiles"):
+                            _scan_shapefiles.clear()
 
                     with col2:
                         # Find shapefiles in directory
                         found_shapefiles = find_shapefiles(search_dir)
 
                         if found_shapefiles:
+                            # Narrow large directories with a filter and cap the dropdown size
+                            filter_txt = st.text_input("Filter shapefiles:", value="", key="shapefile_filter").lower()
+                            filtered = [shp for shp in found_shapefiles if filter_txt in shp.name.lower()][:MAX_SHAPEFILE_OPTIONS]
+                            st.caption(f"Showing {len(filtered)} of {len(found_shapefiles)} shapefiles")
+
                             # Create dropdown options
-                            shapefile_options = ["[Type path manually]"] + [str(shp) for shp in found_shapefiles]
+                            shapefile_options = ["[Type path manually]"] + [str(shp) for shp in filtered]
 
                             selected_shapefile = st.selectbox(
                                 "Available shapefiles:",
@@ -558,7 +1516,7 @@ with mode_tab_switzerland:
                                 # Manual path input only if user chooses to type manually
                                 roi_shapefile = st.text_input(
                                     "Shapefile path:",
-                                    value=st.session_state.config.get('roi_shapefile', ''),
+                                    value=st.session_state.config['roi_shapefile'],
                                     help="Path to .shp file (must be in a mounted volume: config/, shapefiles/, etc.)"
                                 )
                                 st.session_state['roi_validated'] = bool(roi_shapefile)
@@ -566,7 +1524,7 @@ with mode_tab_switzerland:
                             st.info(f"ℹ️ No shapefiles found in `{search_dir}`. Enter path manually below.")
                             roi_shapefile = st.text_input(
                                 "Shapefile path:",
-                                value=st.session_state.config.get('roi_shapefile', ''),
+                                value=st.session_state.config['roi_shapefile'],
                                 help="Path to .shp file (must be in a mounted volume: config/, shapefiles/, etc.)"
                             )
                             st.session_state['roi_validated'] = bool(roi_shapefile)
@@ -578,51 +1536,14 @@ with mode_tab_switzerland:
                     # DEM Settings
                     # st.markdown("#### DEM Settings")
 
-                    gsd_ref = st.selectbox(
-                        "Reference DEM Resolution",
-                        [0.5, 2.0],
-                        index=[0.5, 2.0].index(float(st.session_state.config.get('gsd_ref', 2.0))),
-                        help="Source DEM resolution from Swisstopo"
-                    )
-
-                    gsd = st.number_input(
-                        "Output Grid Spacing - meters",
-                        value=max(float(st.session_state.config.get('gsd', 10.0)), gsd_ref),
-                        min_value=gsd_ref,
-                        max_value=100.0,
-                        step=1.0,
-                        help="Output resolution (smaller = higher resolution, longer processing). Must be >= reference DEM resolution."
-                    )
-
-                    mask_lus = st.checkbox(
-                        "Mask LUS to polygon shape",
-                        value=True,
-                        help="If checked, LUS (land use surface) is cropped to polygon. "
-                             "If unchecked, LUS covers entire bounding box. "
-                             "Note: Grid extent is always the bounding box.",
-                        key="mask_lus_checkbox_existing_shp"
-                    )
-                    st.session_state.config['mask_lus_to_polygon'] = mask_lus
-
-                    mask_dem = st.checkbox(
-                        "Mask DEM to polygon shape",
-                        value=mask_lus,  # Default to same as LUS
-                        disabled=not mask_lus,  # Can only enable if LUS is masked
-                        help="If checked, DEM is cropped to polygon (values outside = nodata). "
-                             "If unchecked, DEM covers entire bounding box with all valid values. "
-                             "Note: Grid extent is always the bounding box. "
-                             "Cannot be checked if LUS masking is disabled.",
-                        key="mask_dem_checkbox_existing_shp"
-                    )
-                    # DEM can only be masked if LUS is also masked
-                    st.session_state.config['mask_dem_to_polygon'] = mask_dem if mask_lus else False
+                    gsd_ref, gsd, mask_lus, mask_dem = _dem_settings_block("_existing_shp")
             else:
                 # Interactive map for drawing ROI
                 st.markdown("### Draw ROI on Swiss Map")
                 st.info("**Instructions**: Use the rectangle (□) or polygon (⬠) tool on the left side of the map to draw your ROI.")
 
                 # Initialize roi_shapefile from session state
-                roi_shapefile = st.session_state.config.get('roi_shapefile', '')
+                roi_shapefile = st.session_state.config['roi_shapefile']
 
                 # Create two columns: map on left, controls on right
                 map_col, controls_col = st.columns([2, 1])
@@ -630,7 +1551,11 @@ with mode_tab_switzerland:
                 with map_col:
                     # Show map
                     roi_map = create_roi_map()
-                    map_output = st_folium(roi_map, width=600, height=500, key="roi_map")
+                    st_folium = importlib.import_module('streamlit_folium').st_folium
+                    map_output = st_folium(
+                        roi_map, width=600, height=500, key="roi_map",
+                        returned_objects=["last_active_drawing"]  # pan/zoom does not trigger a rerun
+                    )
 
                 with controls_col:
                     st.markdown("#### Save ROI")
@@ -661,14 +1586,14 @@ with mode_tab_switzerland:
 
                             if save_button and shapefile_name:
                                 # Save shapefile
-                                shapefile_dir = Path("config/shapefiles")
+                                shapefile_dir = CONFIG_DIR / "shapefiles"
                                 shapefile_path = shapefile_dir / f"{shapefile_name}.shp"
 
                                 success, message = save_drawn_roi(drawn_geom, str(shapefile_path))
                                 if success:
                                     st.success(message)
                                     roi_shapefile = str(shapefile_path)
-                                    st.session_state.config['roi_shapefile'] = str(shapefile_path)
+                                    update_config({'roi_shapefile': str(shapefile_path)})
                                     # Mark ROI as validated (polygon was already validated above)
                                     st.session_state['roi_validated'] = True
                                 else:
@@ -688,49 +1613,11 @@ with mode_tab_switzerland:
                     st.divider()
                     st.markdown("#### DEM Settings")
 
-                    gsd_ref = st.selectbox(
-                        "Reference DEM Resolution",
-                        [0.5, 2.0],
-                        index=[0.5, 2.0].index(float(st.session_state.config.get('gsd_ref', 2.0))),
-                        help="Source DEM resolution from Swisstopo"
-                    )
-
-                    gsd = st.number_input(
-                        "Output Grid Spacing - meters",
-                        value=max(float(st.session_state.config.get('gsd', 10.0)), gsd_ref),
-                        min_value=gsd_ref,
-                        max_value=100.0,
-                        step=1.0,
-                        help="Output resolution (smaller = higher resolution, longer processing). Must be >= reference DEM resolution."
-                    )
-
-                    mask_lus = st.checkbox(
-                        "Mask LUS to polygon shape",
-                        value=True,
-                        help="If checked, LUS (land use surface) is cropped to polygon. "
-                             "If unchecked, LUS covers entire bounding box. "
-                             "Note: Grid extent is always the bounding box.",
-                        key="mask_lus_checkbox"
-                    )
-                    st.session_state.config['mask_lus_to_polygon'] = mask_lus
-
-                    mask_dem = st.checkbox(
-                        "Mask DEM to polygon shape",
-                        value=mask_lus,  # Default to same as LUS
-                        disabled=not mask_lus,  # Can only enable if LUS is masked
-                        help="If checked, DEM is cropped to polygon (values outside = nodata). "
-                             "If unchecked, DEM covers entire bounding box with all valid values. "
-                             "Note: Grid extent is always the bounding box. "
-                             "Cannot be checked if LUS masking is disabled.",
-                        key="mask_dem_checkbox"
-                    )
-                    # DEM can only be masked if LUS is also masked
-                    st.session_state.config['mask_dem_to_polygon'] = mask_dem if mask_lus else False
+                    gsd_ref, gsd, mask_lus, mask_dem = _dem_settings_block("")
         else:
             # Bounding box mode - need center point coordinates
             # Always mask DEM and LUS for bbox mode
-            st.session_state.config['mask_dem_to_polygon'] = True
-            st.session_state.config['mask_lus_to_polygon'] = True
+            update_config({'mask_dem_to_polygon': True, 'mask_lus_to_polygon': True})
             st.markdown("### ROI Center Point")
     
             # Option to pick point on map or enter manually
@@ -743,30 +1630,18 @@ with mode_tab_switzerland:
             if center_point_option == "Pick on map":
                 st.info("**Instructions**: Click anywhere on the map to select the ROI center point.")
     
-                # Create map for point selection
-                center_map = folium.Map(
-                    location=[46.8, 8.2],
-                    zoom_start=8,
-                    tiles=None
-                )
-    
-                # Add Swisstopo base layer
-                folium.raster_layers.WmsTileLayer(
-                    url='https://wms.geo.admin.ch/',
-                    layers='ch.swisstopo.pixelkarte-farbe',
-                    fmt='image/png',
-                    transparent=False,
-                    name='Swisstopo Map',
-                    overlay=False,
-                    control=True,
-                    attr='© swisstopo'
-                ).add_to(center_map)
+                # Create map for point selection (Swisstopo base layer)
+                center_map = create_swisstopo_map()
     
                 # Add click listener for coordinates
-                center_map.add_child(folium.LatLngPopup())
+                center_map.add_child(importlib.import_module('folium').LatLngPopup())
     
                 # Display map and capture clicks
-                center_map_output = st_folium(center_map, width=800, height=400, key="center_point_map")
+                st_folium = importlib.import_module('streamlit_folium').st_folium
+                center_map_output = st_folium(
+                    center_map, width=800, height=400, key="center_point_map",
+                    returned_objects=["last_clicked"]  # pan/zoom does not trigger a rerun
+                )
     
                 # Extract coordinates from map click
                 if center_map_output and center_map_output.get('last_clicked'):
@@ -774,32 +1649,22 @@ with mode_tab_switzerland:
                     lon = center_map_output['last_clicked']['lng']
     
                     # Transform WGS84 to Swiss LV95
-                    transformer = Transformer.from_crs("EPSG:4326", "EPSG:2056", always_xy=True)
+                    transformer = get_transformer("EPSG:4326", "EPSG:2056")
                     poi_x, poi_y = transformer.transform(lon, lat)
     
                     # Fetch elevation from Swisstopo Height API
                     try:
-                        import requests
-                        height_url = f"https://api3.geo.admin.ch/rest/services/height?easting={poi_x:.1f}&northing={poi_y:.1f}&sr=2056"
-                        response = requests.get(height_url, timeout=5)
-    
-                        if response.status_code == 200:
-                            height_data = response.json()
-                            poi_z = float(height_data.get('height', 1500))
-                            st.success(f"✅ Point selected: {poi_x:.1f}, {poi_y:.1f} | Elevation: {poi_z:.1f}m")
-                        else:
-                            # Fallback if API fails
-                            poi_z = float(st.session_state.config.get('poi_z', 1500))
-                            st.warning(f"⚠️ Point selected: {poi_x:.1f}, {poi_y:.1f} | Using default elevation (API unavailable)")
+                        poi_z = fetch_height(round(poi_x), round(poi_y))
+                        st.success(f"✅ Point selected: {poi_x:.1f}, {poi_y:.1f} | Elevation: {poi_z:.1f}m")
                     except Exception:
-                        # Fallback if request fails
-                        poi_z = float(st.session_state.config.get('poi_z', 1500))
-                        st.success(f"✅ Point selected: {poi_x:.1f}, {poi_y:.1f} | Using default elevation")
+                        # Fallback if API fails
+                        poi_z = float(st.session_state.config['poi_z'])
+                        st.warning(f"⚠️ Point selected: {poi_x:.1f}, {poi_y:.1f} | Using default elevation (API unavailable)")
                 else:
                     # Use defaults
-                    poi_x = float(st.session_state.config.get('poi_x', 645000))
-                    poi_y = float(st.session_state.config.get('poi_y', 115000))
-                    poi_z = float(st.session_state.config.get('poi_z', 1500))
+                    poi_x = float(st.session_state.config['poi_x'])
+                    poi_y = float(st.session_state.config['poi_y'])
+                    poi_z = float(st.session_state.config['poi_z'])
     
                 # Show coordinates (read-only display)
                 col1, col2 = st.columns(2)
@@ -823,7 +1688,7 @@ with mode_tab_switzerland:
                 with col1:
                     poi_x = st.number_input(
                         "Easting (EPSG:2056 or CH1903)",
-                        value=float(st.session_state.config.get('poi_x', 645000)),
+                        value=float(st.session_state.config['poi_x']),
                         format="%.1f",
                         help="X coordinate of ROI center (auto-converts CH1903 to EPSG:2056)"
                     )
@@ -831,7 +1696,7 @@ with mode_tab_switzerland:
                 with col2:
                     poi_y = st.number_input(
                         "Northing (EPSG:2056 or CH1903)",
-                        value=float(st.session_state.config.get('poi_y', 115000)),
+                        value=float(st.session_state.config['poi_y']),
                         format="%.1f",
                         help="Y coordinate of ROI center (auto-converts CH1903 to EPSG:2056)"
                     )
@@ -839,7 +1704,7 @@ with mode_tab_switzerland:
                 with col3:
                     poi_z = st.number_input(
                         "Altitude (m)",
-                        value=float(st.session_state.config.get('poi_z', 1500)),
+                        value=float(st.session_state.config['poi_z']),
                         format="%.1f",
                         help="Altitude of ROI center point"
                     )
@@ -847,7 +1712,7 @@ with mode_tab_switzerland:
             # ROI size (applies to both map and manual entry)
             roi_size = st.number_input(
                 "ROI Size (meters)",
-                value=int(st.session_state.config.get('roi_size', 1000)),
+                value=int(st.session_state.config['roi_size']),
                 min_value=100,
                 max_value=50000,
                 step=100,
@@ -868,31 +1733,13 @@ with mode_tab_switzerland:
         # When using shapefile, POI is derived from ROI center (no manual input needed)
         if use_shapefile:
             # Set default POI values (will be overridden by backend from shapefile)
-            poi_x = float(st.session_state.config.get('poi_x', 645000))
-            poi_y = float(st.session_state.config.get('poi_y', 115000))
-            poi_z = float(st.session_state.config.get('poi_z', 1500))
+            poi_x = float(st.session_state.config['poi_x'])
+            poi_y = float(st.session_state.config['poi_y'])
+            poi_z = float(st.session_state.config['poi_z'])
         else:
             # DEM settings for bbox mode (shapefile mode has them in right column)
             st.divider()
-            col1, col2 = st.columns(2)
-
-            with col1:
-                gsd_ref = st.selectbox(
-                    "Reference DEM Resolution",
-                    [0.5, 2.0],
-                    index=[0.5, 2.0].index(float(st.session_state.config.get('gsd_ref', 2.0))),
-                    help="Source DEM resolution from Swisstopo"
-                )
-
-            with col2:
-                gsd = st.number_input(
-                    "Output Grid Spacing - meters",
-                    value=max(float(st.session_state.config.get('gsd', 10.0)), gsd_ref),
-                    min_value=gsd_ref,
-                    max_value=100.0,
-                    step=1.0,
-                    help="Output resolution (smaller = higher resolution, longer processing). Must be >= reference DEM resolution."
-                )
+            gsd_ref, gsd, _, _ = _dem_settings_block("_bbox", show_masks=False, side_by_side=True)
 
         st.divider()
         st.info("Continue to the next tab: **3. POI**")
@@ -916,21 +1763,20 @@ with mode_tab_switzerland:
                 st.session_state.poi_list_ch = []
 
             # Get ROI info from session state
-            _roi_shapefile = st.session_state.config.get('roi_shapefile', '')
+            _roi_shapefile = st.session_state.config['roi_shapefile']
             _use_shapefile = bool(_roi_shapefile)
-            _poi_x = float(st.session_state.config.get('poi_x', 0) or 0)
-            _poi_y = float(st.session_state.config.get('poi_y', 0) or 0)
-            _roi_size = float(st.session_state.config.get('roi_size', 1000) or 1000)
+            _poi_x = float(st.session_state.config['poi_x'] or 0)
+            _poi_y = float(st.session_state.config['poi_y'] or 0)
+            _roi_size = float(st.session_state.config['roi_size'] or 1000)
 
             # Get ROI bounds for validation
             if _use_shapefile and _roi_shapefile:
-                # Load shapefile to get bounds
+                # Load shapefile to get bounds (cached until the file changes)
                 try:
-                    roi_gdf = gpd.read_file(_roi_shapefile)
-                    if roi_gdf.crs and roi_gdf.crs.to_epsg() != 2056:
-                        roi_gdf = roi_gdf.to_crs("EPSG:2056")
-                    roi_bounds = roi_gdf.total_bounds  # (minx, miny, maxx, maxy)
-                    roi_polygon = roi_gdf.union_all()
+                    _roi_mtime = os.path.getmtime(_roi_shapefile)
+                    roi_info = load_roi_shapefile(_roi_shapefile, _roi_mtime)
+                    roi_bounds = roi_info['bounds']  # (minx, miny, maxx, maxy)
+                    roi_polygon = load_roi_polygon(_roi_shapefile, _roi_mtime)
                 except Exception:
                     roi_bounds = None
                     roi_polygon = None
@@ -940,183 +1786,227 @@ with mode_tab_switzerland:
                 roi_bounds = (_poi_x - half_size, _poi_y - half_size, _poi_x + half_size, _poi_y + half_size)
                 roi_polygon = None
 
-            # Two columns: map on left, form/table on right
-            col_map, col_form = st.columns([2, 1])
-
-            with col_map:
-                st.subheader("Add POI on Map")
-                st.caption("Click on the map to add a POI. Elevation is fetched automatically from Swisstopo.")
-
-                # Create map centered on ROI
-                if roi_bounds is not None:
-                    center_x = (roi_bounds[0] + roi_bounds[2]) / 2
-                    center_y = (roi_bounds[1] + roi_bounds[3]) / 2
-                    transformer_to_wgs = Transformer.from_crs("EPSG:2056", "EPSG:4326", always_xy=True)
-                    center_lon, center_lat = transformer_to_wgs.transform(center_x, center_y)
-                else:
-                    center_lat, center_lon = 46.8, 8.2
+            # The POI editor (map, form and list) runs as a fragment: its clicks
+            # and buttons rerun only this block instead of the whole app
+            @st.fragment
+            def poi_editor():
+                # Two columns: map on left, form/table on right
+                col_map, col_form = st.columns([2, 1])
+
+                with col_map:
+                    st.subheader("Add POI on Map")
+                    st.caption("Click on the map to add a POI. Elevation is fetched automatically from Swisstopo.")
+
+                    folium = importlib.import_module('folium')
+                    st_folium = importlib.import_module('streamlit_folium').st_folium
+
+                    # Shared transformer, built once per process (see get_transformer)
+                    transformer_to_wgs = get_transformer("EPSG:2056", "EPSG:4326")
+
+                    # Create map centered on ROI (SW corner, NE corner and center
+                    # reprojected in a single transform call)
+                    if roi_bounds is not None:
+                        center_x = (roi_bounds[0] + roi_bounds[2]) / 2
+                        center_y = (roi_bounds[1] + roi_bounds[3]) / 2
+                        lons, lats = transformer_to_wgs.transform(
+                            [roi_bounds[0], roi_bounds[2], center_x],
+                            [roi_bounds[1], roi_bounds[3], center_y]
+                        )
+                        sw_lon, ne_lon, center_lon = lons
+                        sw_lat, ne_lat, center_lat = lats
+                    else:
+                        center_lat, center_lon = 46.8, 8.2
 
-                poi_map = folium.Map(
-                    location=[center_lat, center_lon],
-                    tiles="https://wmts.geo.admin.ch/1.0.0/ch.swisstopo.pixelkarte-farbe/default/current/3857/{z}/{x}/{y}.jpeg",
-                    attr="swisstopo"
-                )
+                    poi_map = folium.Map(
+                        location=[center_lat, center_lon],
+                        tiles="https://wmts.geo.admin.ch/1.0.0/ch.swisstopo.pixelkarte-farbe/default/current/3857/{z}/{x}/{y}.jpeg",
+                        attr="swisstopo"
+                    )
 
-                # Auto-fit map to ROI bounds
-                if roi_bounds is not None:
-                    sw_lon, sw_lat = transformer_to_wgs.transform(roi_bounds[0], roi_bounds[1])
-                    ne_lon, ne_lat = transformer_to_wgs.transform(roi_bounds[2], roi_bounds[3])
-                    poi_map.fit_bounds([[sw_lat, sw_lon], [ne_lat, ne_lon]])
-
-                # Draw ROI boundary on map
-                if roi_bounds is not None:
-                    transformer_to_wgs = Transformer.from_crs("EPSG:2056", "EPSG:4326", always_xy=True)
-                    if roi_polygon is not None and _use_shapefile:
-                        # Draw shapefile polygon
-                        from shapely.geometry import mapping
-                        import json
-                        roi_geojson = roi_gdf.to_crs("EPSG:4326").to_json()
-                        folium.GeoJson(
-                            roi_geojson,
-                            style_function=lambda x: {'fillColor': 'blue', 'color': 'blue', 'weight': 2, 'fillOpacity': 0.1}
-                        ).add_to(poi_map)
-                    else:
-                        # Draw bounding box
-                        sw_lon, sw_lat = transformer_to_wgs.transform(roi_bounds[0], roi_bounds[1])
-                        ne_lon, ne_lat = transformer_to_wgs.transform(roi_bounds[2], roi_bounds[3])
-                        folium.Rectangle(
-                            bounds=[[sw_lat, sw_lon], [ne_lat, ne_lon]],
-                            color='blue',
-                            weight=2,
-                            fill=True,
-                            fillOpacity=0.1
+                    # Auto-fit map to ROI bounds
+                    if roi_bounds is not None:
+                        poi_map.fit_bounds([[sw_lat, sw_lon], [ne_lat, ne_lon]])
+
+                    # Draw ROI boundary on map
+                    if roi_bounds is not None:
+                        if roi_polygon is not None and _use_shapefile:
+                            # Draw shapefile polygon
+                            folium.GeoJson(
+                                roi_info['geojson_wgs84'],
+                                style_function=lambda x: {'fillColor': 'blue', 'color': 'blue', 'weight': 2, 'fillOpacity': 0.1}
+                            ).add_to(poi_map)
+                        else:
+                            # Draw bounding box
+                            folium.Rectangle(
+                                bounds=[[sw_lat, sw_lon], [ne_lat, ne_lon]],
+                                color='blue',
+                                weight=2,
+                                fill=True,
+                                fillOpacity=0.1
+                            ).add_to(poi_map)
+
+                    # Marker positions/popups are only recomputed when the POI list changes
+                    # (the folium Map itself cannot be reused: st_folium mutates it)
+                    poi_key = tuple((p['name'], p['x'], p['y'], p['z']) for p in st.session_state.poi_list_ch)
+                    cached_markers = st.session_state.get('_poi_markers')
+                    if cached_markers is None or cached_markers[0] != poi_key:
+                        markers = []
+                        if poi_key:
+                            _, xs, ys, _ = zip(*poi_key)
+                            lons, lats = transformer_to_wgs.transform(xs, ys)
+                            markers = [
+                                (lat, lon, f"{name}<br>({x:.0f}, {y:.0f})<br>{z:.0f}m")
+                                for (name, x, y, z), lon, lat in zip(poi_key, lons, lats)
+                            ]
+                        cached_markers = (poi_key, markers)
+                        st.session_state['_poi_markers'] = cached_markers
+
+                    # Add existing POIs as markers (built client-side from a compact array)
+                    if cached_markers[1]:
+                        FastMarkerCluster = importlib.import_module('folium.plugins').FastMarkerCluster
+                        FastMarkerCluster(
+                            [list(marker) for marker in cached_markers[1]],
+                            callback=_POI_MARKER_CALLBACK
                         ).add_to(poi_map)
 
-                # Add existing POIs as markers
-                for idx, poi in enumerate(st.session_state.poi_list_ch):
-                    transformer_to_wgs = Transformer.from_crs("EPSG:2056", "EPSG:4326", always_xy=True)
-                    lon, lat = transformer_to_wgs.transform(poi['x'], poi['y'])
-                    folium.Marker(
-                        location=[lat, lon],
-                        popup=f"{poi['name']}<br>({poi['x']:.0f}, {poi['y']:.0f})<br>{poi['z']:.0f}m",
-                        icon=folium.Icon(color='red', icon='info-sign')
-                    ).add_to(poi_map)
+                    # Enable click to add POI
+                    poi_map.add_child(folium.LatLngPopup())
 
-                # Enable click to add POI
-                poi_map.add_child(folium.LatLngPopup())
-
-                # Display map and capture clicks
-                poi_map_output = st_folium(poi_map, width=600, height=400, key="poi_map_ch")
+                    # Display map and capture clicks
+                    poi_map_output = st_folium(
+                        poi_map, width=600, height=400, key="poi_map_ch",
+                        returned_objects=["last_clicked"]  # pan/zoom does not trigger a rerun
+                    )
 
-                # Process map click
-                if poi_map_output and poi_map_output.get('last_clicked'):
-                    lat = poi_map_output['last_clicked']['lat']
-                    lon = poi_map_output['last_clicked']['lng']
+                    # Process map click
+                    if poi_map_output and poi_map_output.get('last_clicked'):
+                        lat = poi_map_output['last_clicked']['lat']
+                        lon = poi_map_output['last_clicked']['lng']
 
-                    # Transform WGS84 to Swiss LV95
-                    transformer_to_ch = Transformer.from_crs("EPSG:4326", "EPSG:2056", always_xy=True)
-                    click_x, click_y = transformer_to_ch.transform(lon, lat)
+                        # Transform WGS84 to Swiss LV95
+                        transformer_to_ch = get_transformer("EPSG:4326", "EPSG:2056")
+                        click_x, click_y = transformer_to_ch.transform(lon, lat)
 
-                    # Store in session state for the form
-                    st.session_state['poi_click_x'] = click_x
-                    st.session_state['poi_click_y'] = click_y
+                        # Store in session state for the form
+                        st.session_state['poi_click_x'] = click_x
+                        st.session_state['poi_click_y'] = click_y
 
-                    # Fetch elevation from Swisstopo
-                    try:
-                        import requests
-                        height_url = f"https://api3.geo.admin.ch/rest/services/height?easting={click_x:.1f}&northing={click_y:.1f}&sr=2056"
-                        response = requests.get(height_url, timeout=5)
-                        if response.status_code == 200:
-                            height_data = response.json()
-                            st.session_state['poi_click_z'] = float(height_data.get('height', 0))
-                        else:
+                        # Fetch elevation from Swisstopo
+                        try:
+                            st.session_state['poi_click_z'] = fetch_height(round(click_x), round(click_y))
+                        except Exception:
                             st.session_state['poi_click_z'] = 0.0
-                    except Exception:
-                        st.session_state['poi_click_z'] = 0.0
-
-                    st.info(f"Clicked: ({click_x:.0f}, {click_y:.0f}) at {st.session_state.get('poi_click_z', 0):.0f}m - Enter a name and click 'Add POI'")
-
-            with col_form:
-                st.subheader("POI Details")
-
-                # Function to check if POI is within ROI
-                def is_poi_in_roi(x, y):
-                    if roi_polygon is not None and use_shapefile:
-                        from shapely.geometry import Point
-                        return roi_polygon.contains(Point(x, y))
-                    elif roi_bounds is not None:
-                        return (roi_bounds[0] <= x <= roi_bounds[2] and
-                                roi_bounds[1] <= y <= roi_bounds[3])
-                    return True
-
-                # Form to add POI
-                with st.form("add_poi_form_ch", clear_on_submit=True):
-                    poi_name_ch = st.text_input(
-                        "POI Name",
-                        value="",
-                        placeholder="e.g., Summit, Station1"
-                    )
 
-                    # Pre-fill from map click or allow manual entry
-                    poi_x_ch = st.number_input(
-                        "Easting (EPSG:2056)",
-                        value=float(st.session_state.get('poi_click_x', 0)),
-                        format="%.1f"
-                    )
-                    poi_y_ch = st.number_input(
-                        "Northing (EPSG:2056)",
-                        value=float(st.session_state.get('poi_click_y', 0)),
-                        format="%.1f"
-                    )
-                    poi_z_ch = st.number_input(
-                        "Elevation (m)",
-                        value=float(st.session_state.get('poi_click_z', 0)),
-                        format="%.1f"
-                    )
+                        st.info(f"Clicked: ({click_x:.0f}, {click_y:.0f}) at {st.session_state.get('poi_click_z', 0):.0f}m - Enter a name and click 'Add POI'")
+
+                with col_form:
+                    st.subheader("POI Details")
+
+                    # Function to check if POI is within ROI
+                    # (vectorized: accepts scalars or coordinate arrays)
+                    def is_poi_in_roi(x, y):
+                        if roi_bounds is None:
+                            return True
+                        is_scalar = np.ndim(x) == 0
+                        x, y = np.atleast_1d(x).astype(float), np.atleast_1d(y).astype(float)
+
+                        # Cheap bbox test first; the polygon test only runs on bbox hits
+                        inside = ((roi_bounds[0] <= x) & (x <= roi_bounds[2]) &
+                                  (roi_bounds[1] <= y) & (y <= roi_bounds[3]))
+                        if roi_polygon is not None and use_shapefile and inside.any():
+                            inside[inside] = shapely.contains_xy(roi_polygon, x[inside], y[inside])
+                        return bool(inside[0]) if is_scalar else inside
+
+                    # Form to add POI
+                    with st.form("add_poi_form_ch", clear_on_submit=True):
+                        poi_name_ch = st.text_input(
+                            "POI Name",
+                            value="",
+                            placeholder="e.g., Summit, Station1"
+                        )
 
-                    add_poi_btn = st.form_submit_button("Add POI", type="primary", use_container_width=True)
+                        # Pre-fill from map click or allow manual entry
+                        poi_x_ch = st.number_input(
+                            "Easting (EPSG:2056)",
+                            value=float(st.session_state.get('poi_click_x', 0)),
+                            format="%.1f"
+                        )
+                        poi_y_ch = st.number_input(
+                            "Northing (EPSG:2056)",
+                            value=float(st.session_state.get('poi_click_y', 0)),
+                            format="%.1f"
+                        )
+                        poi_z_ch = st.number_input(
+                            "Elevation (m)",
+                            value=float(st.session_state.get('poi_click_z', 0)),
+                            format="%.1f"
+                        )
 
-                    if add_poi_btn:
-                        if not poi_name_ch:
-                            st.error("Please enter a POI name")
-                        elif poi_x_ch == 0 and poi_y_ch == 0:
-                            st.error("Please click on the map or enter coordinates")
-                        elif not is_poi_in_roi(poi_x_ch, poi_y_ch):
-                            st.error("POI is outside the defined ROI boundary")
-                        else:
-                            st.session_state.poi_list_ch.append({
-                                'name': poi_name_ch,
-                                'x': poi_x_ch,
-                                'y': poi_y_ch,
-                                'z': poi_z_ch
-                            })
-                            # Clear click coordinates
-                            st.session_state.pop('poi_click_x', None)
-                            st.session_state.pop('poi_click_y', None)
-                            st.session_state.pop('poi_click_z', None)
-                            st.rerun()
+                        add_poi_btn = st.form_submit_button("Add POI", type="primary", use_container_width=True)
 
-                st.divider()
+                        if add_poi_btn:
+                            if not poi_name_ch:
+                                st.error("Please enter a POI name")
+                            elif poi_x_ch == 0 and poi_y_ch == 0:
+                                st.error("Please click on the map or enter coordinates")
+                            elif not is_poi_in_roi(poi_x_ch, poi_y_ch):
+                                st.error("POI is outside the defined ROI boundary")
+                            else:
+                                st.session_state.poi_list_ch.append({
+                                    'name': poi_name_ch,
+                                    'x': poi_x_ch,
+                                    'y': poi_y_ch,
+                                    'z': poi_z_ch
+                                })
+                                # Clear click coordinates
+                                st.session_state.pop('poi_click_x', None)
+                                st.session_state.pop('poi_click_y', None)
+                                st.session_state.pop('poi_click_z', None)
+                                st.rerun()
 
-                # Display POI table
-                st.subheader(f"POI List ({len(st.session_state.poi_list_ch)})")
+                    st.divider()
 
-                if st.session_state.poi_list_ch:
-                    for idx, poi in enumerate(st.session_state.poi_list_ch):
-                        col1, col2 = st.columns([4, 1])
-                        with col1:
-                            st.text(f"{poi['name']}: ({poi['x']:.0f}, {poi['y']:.0f}, {poi['z']:.0f}m)")
-                        with col2:
-                            if st.button("🗑️", key=f"del_poi_ch_{idx}", help="Delete this POI"):
-                                st.session_state.poi_list_ch.pop(idx)
-                                st.rerun()
+                    # Display POI table
+                    st.subheader(f"POI List ({len(st.session_state.poi_list_ch)})")
+
+                    if st.session_state.poi_list_ch:
+                        # One editable table: rename/set elevation inline, delete rows
+                        # with the row selector. Coordinates only change through the
+                        # add form above, which checks them against the ROI.
+                        editor_version = st.session_state.get('poi_editor_ch_version', 0)
+                        edited_pois = st.data_editor(
+                            st.session_state.poi_list_ch,
+                            num_rows="dynamic",
+                            disabled=["x", "y"],
+                            column_config={
+                                "name": st.column_config.TextColumn("Name", required=True),
+                                "x": st.column_config.NumberColumn("Easting", format="%.0f"),
+                                "y": st.column_config.NumberColumn("Northing", format="%.0f"),
+                                "z": st.column_config.NumberColumn("Elevation (m)", format="%.0f"),
+                            },
+                            hide_index=True,
+                            width="stretch",
+                            key=f"poi_editor_ch_{editor_version}"
+                        )
+                        if edited_pois != st.session_state.poi_list_ch:
+                            # Rows added in the table have no coordinates and are dropped
+                            st.session_state.poi_list_ch = [
+                                {**poi, 'z': poi['z'] if poi['z'] is not None else 0.0}
+                                for poi in edited_pois
+                                if poi['name'] and poi['x'] is not None and poi['y'] is not None
+                            ]
+                            # New editor key, so its pending edits are not applied twice
+                            st.session_state['poi_editor_ch_version'] = editor_version + 1
+                            st.rerun()
 
-                    # Clear all button
-                    if st.button("Clear All POIs", type="secondary", use_container_width=True):
-                        st.session_state.poi_list_ch = []
-                        st.rerun()
-                else:
-                    st.caption("No POIs added yet. Click on the map or enter coordinates manually.")
+                        # Clear all button
+                        if st.button("Clear All POIs", type="secondary", use_container_width=True):
+                            st.session_state.poi_list_ch = []
+                            st.rerun()
+                    else:
+                        st.caption("No POIs added yet. Click on the map or enter coordinates manually.")
+
+            poi_editor()
 
         st.divider()
         st.info("Continue to the next tab: **4. Landcover**")
@@ -1128,81 +2018,40 @@ with mode_tab_switzerland:
         st.header("Land Cover")
         st.caption("Alpine3D uses 'LUS' (Land Use Surface) internally, but this actually refers to land cover classification.")
 
-        # Dropdown for source selection
-        lus_source_options = ["SwissTLMRegio", "BFS Arealstatistik (NOAS04)", "Constant Value"]
-        lus_source_map = {
-            "SwissTLMRegio": "tlm",
-            "BFS Arealstatistik (NOAS04)": "bfs",
-            "Constant Value": "constant"
-        }
-        lus_source_reverse = {v: k for k, v in lus_source_map.items()}
-
-        # Get default from config (with backwards compatibility)
-        default_source = st.session_state.config.get('lus_source', 'tlm')
-        if default_source not in lus_source_map.values():
-            default_source = 'tlm'
-        default_display = lus_source_reverse.get(default_source, "SwissTLMRegio")
-        default_idx = lus_source_options.index(default_display)
+        # Dropdown for source selection (unknown config values fall back to TLM)
+        default_idx = _LUS_SOURCE_IDX.get(st.session_state.config['lus_source'], 0)
 
         lus_source_display = st.selectbox(
             "Land Cover Data Source",
-            options=lus_source_options,
+            options=_LUS_SOURCE_CHOICES,
             index=default_idx,
             help="**SwissTLMRegio**: Swisstopo topographic land cover (11 categories)\n\n"
                  "**BFS Arealstatistik (NOAS04)**: Federal statistics LC_27 classification (27 categories)\n\n"
                  "**Constant Value**: Single PREVAH code for entire domain"
         )
 
-        lus_source = lus_source_map[lus_source_display]
+        lus_source = _LUS_SOURCE_CODES[lus_source_display]
 
         # Only show constant value input when "Constant Value" is selected
         if lus_source == "constant":
             lus_constant = st.number_input(
                 "Constant PREVAH Code",
-                value=int(st.session_state.config.get('lus_cst', 11500)),
+                value=int(st.session_state.config['lus_cst']),
                 help="Single PREVAH land cover code (format: 1LLCD where LL is PREVAH code)."
             )
         else:
-            lus_constant = int(st.session_state.config.get('lus_cst', 11500))
+            lus_constant = int(st.session_state.config['lus_cst'])
 
             # Show mapping table for selected source
-            with st.expander("View category mapping to PREVAH codes", expanded=False):
+            # Checkbox instead of an expander: a collapsed expander still builds
+            # and sends its tables, an unchecked box skips them
+            if st.checkbox("View category mapping to PREVAH codes", key="show_lus_mapping"):
                 if lus_source == "tlm":
                     st.markdown("**SwissTLMRegio to PREVAH mapping:**")
-                    tlm_mapping_data = {
-                        "TLM Category": ["Wald", "Fels", "Geroell", "Gletscher", "See", "Stausee",
-                                        "Siedl", "Stadtzentr", "Sumpf", "Obstanlage", "Reben"],
-                        "PREVAH Code": [3, 15, 21, 14, 1, 1, 2, 2, 22, 18, 29],
-                        "PREVAH Description": ["coniferous forest", "rock", "alpine vegetation", "bare ice",
-                                              "water", "water", "settlement", "settlement", "wetlands",
-                                              "fruit", "grapes"]
-                    }
-                    st.table(tlm_mapping_data)
+                    st.table(TLM_PREVAH_MAPPING)
                 elif lus_source == "bfs":
                     st.markdown("**BFS Arealstatistik LC_27 to PREVAH mapping:**")
-                    lc27_mapping_data = {
-                        "LC_27": list(range(1, 28)),
-                        "Description": [
-                            "Industrial buildings", "Commercial/services", "Residential",
-                            "Agricultural buildings", "Unspecified buildings", "Transport areas",
-                            "Special urban areas", "Recreation/green spaces", "Orchards", "Vineyards",
-                            "Horticulture", "Arable land", "Meadows/pastures", "Alpine pastures",
-                            "Dense forest", "Open forest", "Shrub forest", "Hedges/groves",
-                            "Standing water", "Flowing water", "Unproductive vegetation",
-                            "Bare ground", "Rock", "Sand/gravel", "Glacier/firn", "Wetlands",
-                            "Other unproductive"
-                        ],
-                        "PREVAH": [2, 2, 2, 2, 2, 11, 2, 7, 18, 29, 19, 6, 7, 23,
-                                  5, 5, 8, 8, 1, 1, 21, 26, 15, 26, 14, 22, 27],
-                        "PREVAH Name": [
-                            "settlement", "settlement", "settlement", "settlement", "settlement", "road",
-                            "settlement", "pasture", "fruit", "grapes", "vegetables", "cereals",
-                            "pasture", "rough pasture", "mixed forest", "mixed forest", "bush", "bush",
-                            "water", "water", "alpine vegetation", "bare soil vegetation", "rock",
-                            "bare soil vegetation", "bare ice", "wetlands", "free"
-                        ]
-                    }
-                    st.dataframe(lc27_mapping_data, width="stretch", hide_index=True)
+                    st.dataframe(LC27_PREVAH_MAPPING, width="stretch", hide_index=True)
 
         # Store in session state
         st.session_state.config['lus_source'] = lus_source
@@ -1217,7 +2066,7 @@ with mode_tab_switzerland:
         st.header("Meteo files retrieval with Snowpack")
 
         # IMIS database access requires VPN - only available in local Docker builds
-        _IMIS_AVAILABLE = os.environ.get('A3D_IMIS_AVAILABLE', '').lower() in ('true', '1', 'yes')
+        _IMIS_AVAILABLE = is_imis_available()
 
         if not _IMIS_AVAILABLE:
             st.info("**Snowpack preprocessing disabled** - The web version cannot access the SLF/IMIS database for meteo retrieval. Run locally with Docker to enable.")
@@ -1232,7 +2081,7 @@ with mode_tab_switzerland:
 
         buffer_size = st.number_input(
             "Buffer Size for IMIS Stations (meters)",
-            value=int(st.session_state.config.get('buffer_size', 10000)),
+            value=int(st.session_state.config['buffer_size']),
             min_value=1000,
             max_value=200000,
             step=1000,
@@ -1281,10 +2130,9 @@ with mode_tab_switzerland:
 
                 # Load Snowpack INI template (embedded with file override capability)
                 if 'snowpack_ini_content' not in st.session_state:
-                    try:
-                        st.session_state.snowpack_ini_content = get_template('spConfig.ini')
-                    except KeyError:
-                        st.session_state.snowpack_ini_content = "; Snowpack configuration template not found"
+                    st.session_state.snowpack_ini_content = load_template(
+                        'spConfig.ini', "; Snowpack configuration template not found"
+                    )
 
                 snowpack_ini_edited = st.text_area(
                     "Snowpack INI Content",
@@ -1314,300 +2162,207 @@ with mode_tab_switzerland:
     # Tab 6: Run Config
     # ============================================================
     with tab6:
-        # Output coordinate system selector (at top for visibility)
-        st.subheader("Output Coordinate System")
-        coord_sys_options = ["CH1903+", "CH1903 (Legacy)"]
-        current_coord_sys = st.session_state.config.get('coord_sys', 'CH1903+')
-        # Handle legacy config values
-        if current_coord_sys == "CH1903":
-            current_coord_sys = "CH1903 (Legacy)"
-        elif current_coord_sys not in coord_sys_options:
-            current_coord_sys = "CH1903+"
-        coord_sys_display = st.selectbox(
-            "Select output CRS",
-            coord_sys_options,
-            index=coord_sys_options.index(current_coord_sys),
-            help="Coordinate system for Alpine3D output. CH1903+ (EPSG:2056) is the current Swiss standard. CH1903 (EPSG:21781) is the legacy system Alpine3D was developed on."
-        )
-        # Convert display value back to config value
-        coord_sys = "CH1903" if coord_sys_display == "CH1903 (Legacy)" else coord_sys_display
-
-        st.divider()
-        st.header("Configuration Summary")
-
-        # Build start/end datetime strings
-        start_dt = datetime.combine(start_date, start_time)
-        end_dt = datetime.combine(end_date, end_time)
-
-        # Summary display
-        col1, col2 = st.columns(2)
-
-        with col1:
-            st.metric("Simulation Name", simu_name)
-            st.metric("Period", f"{(end_dt - start_dt).days} days")
-            st.metric("Output CRS", coord_sys)
-            st.metric("Grid Spacing", f"{gsd}m")
+        # Only build the summary/run section while this tab is open
+        if tab6.open:
+            # Output coordinate system selector (at top for visibility)
+            st.subheader("Output Coordinate System")
+            current_coord_sys = st.session_state.config['coord_sys']
+            # Handle legacy config values (unknown values fall back to CH1903+)
+            if current_coord_sys == "CH1903":
+                current_coord_sys = "CH1903 (Legacy)"
+            coord_sys_display = st.selectbox(
+                "Select output CRS",
+                _COORD_SYS_CHOICES,
+                index=_COORD_SYS_IDX.get(current_coord_sys, 0),
+                help="Coordinate system for Alpine3D output. CH1903+ (EPSG:2056) is the current Swiss standard. CH1903 (EPSG:21781) is the legacy system Alpine3D was developed on."
+            )
+            # Convert display value back to config value (kept in config, since the
+            # selectbox is not rendered while the tab is closed)
+            coord_sys = "CH1903" if coord_sys_display == "CH1903 (Legacy)" else coord_sys_display
+            st.session_state.config['coord_sys'] = coord_sys
 
-        with col2:
-            if use_shapefile:
-                st.metric("ROI", "Custom Shapefile/Polygon")
-            else:
-                st.metric("ROI", f"{roi_size}m bbox")
+            st.divider()
+            st.header("Configuration Summary")
 
-            # Land use option
-            lus_labels = {
-                "tlm": "SwissTLMRegio",
-                "bfs": "BFS Arealstatistik",
-                "constant": f"Constant ({lus_constant})"
-            }
-            st.metric("Land Use", lus_labels.get(lus_source, "Unknown"))
+            # Build start/end datetime strings
+            start_dt = datetime.combine(start_date, start_time)
+            end_dt = datetime.combine(end_date, end_time)
 
+            # Summary display: (label, value) pairs laid out on a 4-column grid
+            poi_count = len(st.session_state.get('poi_list_ch', []))
+            metrics = [
+                ("Simulation Name", simu_name),
+                ("Period", f"{(end_dt - start_dt).days} days"),
+                ("Output CRS", coord_sys),
+                ("Grid Spacing", f"{gsd}m"),
+                ("ROI", "Custom Shapefile/Polygon" if use_shapefile else f"{roi_size}m bbox"),
+                ("Land Use", f"Constant ({lus_constant})" if lus_source == "constant"
+                 else _LUS_SOURCE_LABELS.get(lus_source, "Unknown")),
+            ]
             # DEM and LUS masking options (only show if using shapefile)
             if use_shapefile:
-                mask_dem_status = st.session_state.config.get('mask_dem_to_polygon', True)
-                mask_lus_status = st.session_state.config.get('mask_lus_to_polygon', True)
-                st.metric("DEM Masking", "Polygon" if mask_dem_status else "Full BBox")
-                st.metric("LUS Masking", "Polygon" if mask_lus_status else "Full BBox")
+                metrics += [
+                    ("DEM Masking", "Polygon" if st.session_state.config['mask_dem_to_polygon'] else "Full BBox"),
+                    ("LUS Masking", "Polygon" if st.session_state.config['mask_lus_to_polygon'] else "Full BBox"),
+                ]
+            metrics.append(("POIs", poi_count if poi_count > 0 else "None"))
 
-            # POI count
-            poi_count = len(st.session_state.get('poi_list_ch', []))
-            st.metric("POIs", poi_count if poi_count > 0 else "None")
+            metric_cols = st.columns(4)
+            for idx, (label, value) in enumerate(metrics):
+                metric_cols[idx % 4].metric(label, value)
 
-        st.divider()
+            st.divider()
 
-        # Save config section
-        col1, col2 = st.columns([3, 1])
-    
-        with col1:
-            save_config_name = st.text_input(
-                "Config filename (without .ini)",
-                value=simu_name if simu_name else "my_simulation",
-                help="Name for saving this A3Dshell configuration"
-            )
+            def write_config(path, header):
+                # Rendered only when Save/Run is clicked
+                write_ini(
+                    path, header, st.session_state.get('poi_list_ch'),
+                    simu_name, start_dt, end_dt, poi_x, poi_y, poi_z,
+                    use_shapefile, roi_shapefile if use_shapefile else None,
+                    None if use_shapefile else roi_size, buffer_size, coord_sys,
+                    gsd, gsd_ref,
+                    st.session_state.config['mask_dem_to_polygon'],
+                    st.session_state.config['mask_lus_to_polygon'],
+                    lus_source, lus_constant
+                )
+
+            # Save config section
+            col1, col2 = st.columns([3, 1])
     
-        with col2:
-            st.write("")  # Spacing
-            st.write("")  # Spacing
-            save_button = st.button("Save Config", width="stretch")
+            with col1:
+                save_config_name = st.text_input(
+                    "Config filename (without .ini)",
+                    value=simu_name if simu_name else "my_simulation",
+                    help="Name for saving this A3Dshell configuration"
+                )
     
-        if save_button:
-            if not save_config_name:
-                st.error("Please provide a config filename")
-            else:
-                # Create config file
-                config_content = f"""# A3Dshell Configuration
-# Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-[GENERAL]
-SIMULATION_NAME = {simu_name}
-START_DATE = {start_dt.strftime('%Y-%m-%dT%H:%M:%S')}
-END_DATE = {end_dt.strftime('%Y-%m-%dT%H:%M:%S')}
-
-[INPUT]
-EAST_epsg2056 = {poi_x}
-NORTH_epsg2056 = {poi_y}
-altLV95 = {poi_z}
-USE_SHP_ROI = {'true' if use_shapefile else 'false'}
-"""
+            with col2:
+                st.write("")  # Spacing
+                st.write("")  # Spacing
+                save_button = st.button("Save Config", width="stretch")
     
-                if use_shapefile:
-                    config_content += f"ROI_SHAPEFILE = {roi_shapefile}\n"
+            if save_button:
+                if not save_config_name:
+                    st.error("Please provide a config filename")
                 else:
-                    config_content += f"ROI = {roi_size}\n"
-
-                config_content += f"BUFFERSIZE = {buffer_size}\n"
-                config_content += f"\n[OUTPUT]\n"
-                config_content += f"OUT_COORDSYS = {coord_sys}\n"
-                config_content += f"GSD = {gsd}\n"
-                config_content += f"GSD_ref = {gsd_ref}\n"
-                config_content += f"DEM_ADDFMTLIST =\n"
-                config_content += f"MESH_FMT = vtu\n"
-                config_content += f"MASK_DEM_TO_POLYGON = {'true' if st.session_state.config.get('mask_dem_to_polygon', True) else 'false'}\n"
-                config_content += f"MASK_LUS_TO_POLYGON = {'true' if st.session_state.config.get('mask_lus_to_polygon', True) else 'false'}\n"
-                config_content += f"\n[MAPS]\n"
-                config_content += f"PLOT_HORIZON = false\n"
-                config_content += f"\n[A3D]\n"
-                config_content += f"USE_GROUNDEYE = false\n"
-                config_content += f"LUS_SOURCE = {lus_source}\n"
-
-                if lus_source == "constant":
-                    config_content += f"LUS_PREVAH_CST = {lus_constant}\n"
-
-                config_content += "DO_PVP_3D = false\n"
-                config_content += "PVP_3D_FMT = vtu\n"
-                config_content += "SP_BIN_PATH = snowpack\n"
-
-                # Add POIs if defined
-                if st.session_state.get('poi_list_ch'):
-                    config_content += "\n[POIS]\n"
-                    for poi in st.session_state.poi_list_ch:
-                        config_content += f"{poi['name']} = {poi['x']},{poi['y']},{poi['z']}\n"
-
-                # Save file
-                config_path = config_dir / f"{save_config_name}.ini"
-                with open(config_path, 'w') as f:
-                    f.write(config_content)
-
-                st.success(f"✅ Configuration saved to: {config_path}")
+                    # Save config file
+                    config_path = CONFIG_DIR / f"{save_config_name}.ini"
+                    write_config(
+                        config_path,
+                        f"# A3Dshell Configuration\n# Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+                    )
 
-        st.divider()
+                    st.success(f"✅ Configuration saved to: {config_path}")
 
-        # Run simulation section
-        st.header("Run Setup")
+            st.divider()
 
-        log_level = st.selectbox("Log Level", ["INFO", "DEBUG", "WARNING", "ERROR"])
-    
-        # Check if ROI is validated
-        roi_validated = st.session_state.get('roi_validated', False)
-    
-        # Show validation status
-        if not roi_validated:
-            st.error("Cannot run simulation: ROI/POI must be confirmed within Swiss boundaries")
-            st.info("Go to the **Location & ROI** tab to configure and validate your region of interest.")
-    
-        # Disable button if validation failed
-        if st.button("▶️ Start Run", type="primary", width="stretch", disabled=not roi_validated):
-            if not simu_name:
-                st.error("Please provide a simulation name")
-            else:
-                # Create a temporary config for this run
-                temp_config = config_dir / f"_temp_{simu_name}.ini"
+            # Run simulation section
+            st.header("Run Setup")
+
+            log_level = st.selectbox("Log Level", ["INFO", "DEBUG", "WARNING", "ERROR"])
     
-                config_content = f"""# Temporary A3Dshell Configuration
-    [GENERAL]
-    SIMULATION_NAME = {simu_name}
-    START_DATE = {start_dt.strftime('%Y-%m-%dT%H:%M:%S')}
-    END_DATE = {end_dt.strftime('%Y-%m-%dT%H:%M:%S')}
+            # Check if ROI is validated
+            roi_validated = st.session_state.get('roi_validated', False)
     
-    [INPUT]
-    EAST_epsg2056 = {poi_x}
-    NORTH_epsg2056 = {poi_y}
-    altLV95 = {poi_z}
-    USE_SHP_ROI = {'true' if use_shapefile else 'false'}
-    """
+            # Show validation status
+            if not roi_validated:
+                st.error("Cannot run simulation: ROI/POI must be confirmed within Swiss boundaries")
+                st.info("Go to the **Location & ROI** tab to configure and validate your region of interest.")
     
-                if use_shapefile:
-                    config_content += f"ROI_SHAPEFILE = {roi_shapefile}\n"
+            # Disable button if validation failed or a run is still in progress
+            run = st.session_state.get('swiss_run')
+            run_in_progress = run is not None and run['returncode'] is None
+            if st.button("▶️ Start Run", type="primary", width="stretch",
+                         disabled=not roi_validated or run_in_progress):
+                if not simu_name:
+                    st.error("Please provide a simulation name")
                 else:
-                    config_content += f"ROI = {roi_size}\n"
-
-                config_content += f"BUFFERSIZE = {buffer_size}\n"
-                config_content += f"\n[OUTPUT]\n"
-                config_content += f"OUT_COORDSYS = {coord_sys}\n"
-                config_content += f"GSD = {gsd}\n"
-                config_content += f"GSD_ref = {gsd_ref}\n"
-                config_content += f"DEM_ADDFMTLIST =\n"
-                config_content += f"MESH_FMT = vtu\n"
-                config_content += f"MASK_DEM_TO_POLYGON = {'true' if st.session_state.config.get('mask_dem_to_polygon', True) else 'false'}\n"
-                config_content += f"MASK_LUS_TO_POLYGON = {'true' if st.session_state.config.get('mask_lus_to_polygon', True) else 'false'}\n"
-                config_content += f"\n[MAPS]\n"
-                config_content += f"PLOT_HORIZON = false\n"
-                config_content += f"\n[A3D]\n"
-                config_content += f"USE_GROUNDEYE = false\n"
-                config_content += f"LUS_SOURCE = {lus_source}\n"
-
-                if lus_source == "constant":
-                    config_content += f"LUS_PREVAH_CST = {lus_constant}\n"
-
-                config_content += "DO_PVP_3D = false\n"
-                config_content += "PVP_3D_FMT = vtu\n"
-                config_content += "SP_BIN_PATH = snowpack\n"
-
-                # Add POIs if defined
-                if st.session_state.get('poi_list_ch'):
-                    config_content += "\n[POIS]\n"
-                    for poi in st.session_state.poi_list_ch:
-                        config_content += f"{poi['name']} = {poi['x']},{poi['y']},{poi['z']}\n"
-
-                # Save temp config
-                with open(temp_config, 'w') as f:
-                    f.write(config_content)
-
-                # Build command
-                cmd = [
-                    "python", "-m", "src.cli",
-                    "--config", str(temp_config),
-                    "--log-level", log_level
-                ]
+                    # Create a temporary config for this run
+                    temp_config = CONFIG_DIR / f"_temp_{simu_name}.ini"
     
-                if skip_snowpack:
-                    cmd.append("--skip-snowpack")
+                    write_config(temp_config, "# Temporary A3Dshell Configuration")
+
+                    # Build command
+                    cmd = [
+                        "python", "-m", "src.cli",
+                        "--config", str(temp_config),
+                        "--log-level", log_level
+                    ]
     
-                st.info(f"🚀 Starting simulation: {simu_name}")
-                st.code(" ".join(cmd), language="bash")
-
-                # Run simulation with real-time output streaming
-                st.subheader("Run Log")
-                log_container = st.container(height=400)
-                log_placeholder = log_container.empty()
-                full_log = []
+                    if skip_snowpack:
+                        cmd.append("--skip-snowpack")
 
-                try:
-                    process = subprocess.Popen(
-                        cmd,
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.STDOUT,
-                        text=True,
-                        bufsize=1
-                    )
+                    # Run in the background; the full log goes to disk
+                    log_path = Path("output") / f"{simu_name}_run.log"
+                    try:
+                        run = {
+                            'process': start_run(cmd, log_path),
+                            'cmd': cmd,
+                            'simu_name': simu_name,
+                            'log_path': log_path,
+                            'temp_config': temp_config,
+                            'returncode': None,
+                        }
+                        st.session_state['swiss_run'] = run
+                        run_in_progress = True
+                    except Exception as e:
+                        st.error(f"❌ Error running simulation: {str(e)}")
+                        temp_config.unlink(missing_ok=True)
 
-                    # Stream output in real-time
-                    for line in process.stdout:
-                        full_log.append(line.rstrip())
-                        # Update log display
-                        log_placeholder.code('\n'.join(full_log), language="text")
+            if run:
+                st.info(f"🚀 Simulation: {run['simu_name']}")
+                st.code(" ".join(run['cmd']), language="bash")
 
-                    process.wait()
+                # Only the log view reruns while the simulation is in progress
+                st.subheader("Run Log")
+                st.fragment(
+                    run_log_view,
+                    run_every=LOG_REFRESH_SECONDS if run_in_progress else None
+                )(run)
+
+                # Finished runs are recorded by collect_run() before the tabs
+                if run['returncode'] is not None:
+                    st.download_button(
+                        label="Download Full Run Log",
+                        data=read_file_on_click(run['log_path']),
+                        file_name=run['log_path'].name,
+                        mime="text/plain",
+                        key="download_run_log"
+                    )
 
-                    if process.returncode == 0:
+                    if run['returncode'] == 0:
                         st.success("✅ Run completed successfully!")
-                        st.snow()
-
-                        # Show output location and set working directory for A3D tab
-                        output_dir = Path("output") / simu_name
-                        if output_dir.exists():
-                            st.info(f"Output location: {output_dir}")
-                            # Set working directory for Run A3D tab
-                            st.session_state.config['a3d_working_dir'] = str(output_dir)
+                        if 'output_dir' in run:
+                            st.info(f"Output location: {run['output_dir']}")
                             st.info("Working directory set for **Run A3D** tab.")
-
-                            # Offer download of the ZIP file produced by the CLI
-                            zip_path = Path("output") / f"{simu_name}.zip"
-                            if zip_path.exists():
-                                with open(zip_path, "rb") as f:
-                                    zip_data = f.read()
-                                st.download_button(
-                                    label="Download Simulation Package (.zip)",
-                                    data=zip_data,
-                                    file_name=f"{simu_name}.zip",
-                                    mime="application/zip"
-                                )
-                            else:
-                                st.warning(f"ZIP file not found at {zip_path}")
+                        if 'missing_zip' in run:
+                            st.warning(f"ZIP file not found at {run['missing_zip']}")
                     else:
-                        st.error(f"❌ Run failed with exit code {process.returncode}")
-
-                except Exception as e:
-                    st.error(f"❌ Error running simulation: {str(e)}")
-
-                finally:
-                    # Clean up temp config
-                    if temp_config.exists():
-                        temp_config.unlink()
+                        st.error(f"❌ Run failed with exit code {run['returncode']}")
+
+            # Keep the package of the last successful run downloadable across reruns
+            last_run_zip = st.session_state.get('last_run_zip')
+            if last_run_zip and os.path.isfile(last_run_zip):
+                st.download_button(
+                    label="Download Simulation Package (.zip)",
+                    data=read_file_on_click(last_run_zip),
+                    file_name=Path(last_run_zip).name,
+                    mime="application/zip"
+                )
 
     # ============================================================
     # Tab 7: Run A3D (enabled via A3D_ENABLE_RUN_TAB env var for local Docker)
     # ============================================================
     with tab7:
         # Enable Tab 7 when running locally with Docker (set in docker-compose.yml)
-        _TAB7_ENABLED = os.environ.get('A3D_ENABLE_RUN_TAB', '').lower() in ('true', '1', 'yes')
+        _TAB7_ENABLED = is_run_tab_enabled()
 
         if not _TAB7_ENABLED:
             st.info("**Run A3D** - This feature is not available in the web version. Run locally with Docker to enable.")
 
         if _TAB7_ENABLED:
             # Default to session state if set, otherwise try output/{simu_name}
-            default_working_dir = st.session_state.config.get('a3d_working_dir', '')
+            default_working_dir = st.session_state.config['a3d_working_dir']
             if not default_working_dir and simu_name:
                 potential_dir = f"output/{simu_name}"
                 if Path(potential_dir).exists():
@@ -1625,13 +2380,12 @@ USE_SHP_ROI = {'true' if use_shapefile else 'false'}
             working_dir_valid = False
             if a3d_working_dir:
                 working_dir_path = Path(a3d_working_dir)
-                if working_dir_path.exists():
-                    input_dir = working_dir_path / "input"
-                    if input_dir.exists():
-                        st.success(f"Working directory found: {a3d_working_dir}")
-                        working_dir_valid = True
-                    else:
-                        st.warning(f"Working directory exists but missing 'input/' folder.")
+                # One stat in the common case: input/ existing implies the directory does
+                if (working_dir_path / "input").exists():
+                    st.success(f"Working directory found: {a3d_working_dir}")
+                    working_dir_valid = True
+                elif working_dir_path.exists():
+                    st.warning(f"Working directory exists but missing 'input/' folder.")
                 else:
                     st.warning(f"Working directory not found: {a3d_working_dir}")
             else:
@@ -1664,10 +2418,9 @@ USE_SHP_ROI = {'true' if use_shapefile else 'false'}
 
             # Load A3D INI template (embedded with file override capability)
             if 'a3d_ini_content' not in st.session_state:
-                try:
-                    st.session_state.a3d_ini_content = get_template('a3dConfig.ini')
-                except KeyError:
-                    st.session_state.a3d_ini_content = "; Alpine3D configuration template not found"
+                st.session_state.a3d_ini_content = load_template(
+                    'a3dConfig.ini', "; Alpine3D configuration template not found"
+                )
 
             a3d_ini_edited = st.text_area(
                 "Alpine3D INI Content",
@@ -1734,7 +2487,7 @@ with mode_tab_other:
 
         simu_name_other = st.text_input(
             "Simulation Name",
-            value=st.session_state.config.get('simu_name', ''),
+            value=st.session_state.config['simu_name'],
             help="Unique name for this simulation (no spaces allowed)",
             key="simu_name_other"
         )
@@ -1754,7 +2507,7 @@ with mode_tab_other:
         st.subheader("Target Coordinate System")
         target_epsg = st.number_input(
             "EPSG Code",
-            value=int(st.session_state.config.get('target_epsg', 32632)),
+            value=int(st.session_state.config['target_epsg']),
             min_value=1000,
             max_value=99999,
             help="EPSG code for your target coordinate system (e.g., 32632 for UTM Zone 32N, 2056 for Swiss LV95)"
@@ -1780,8 +2533,7 @@ with mode_tab_other:
             # ---- UPLOAD LOCAL DEM ----
             st.markdown("Upload your Digital Elevation Model (GeoTIFF format).")
 
-            dem_dir = Path("config/dem")
-            dem_dir.mkdir(parents=True, exist_ok=True)
+            dem_dir = DEM_DIR
 
             # File uploader for DEM
             uploaded_dem = st.file_uploader(
@@ -1793,17 +2545,27 @@ with mode_tab_other:
 
             # Handle uploaded file
             if uploaded_dem is not None:
-                # Save uploaded file to config/dem/
-                dem_save_path = dem_dir / uploaded_dem.name
-                with open(dem_save_path, 'wb') as f:
-                    f.write(uploaded_dem.getbuffer())
+                # Save uploaded file to config/dem/ (once per upload)
+                if st.session_state.get('dem_upload_other_id') != uploaded_dem.file_id:
+                    dem_save_path = dem_dir / uploaded_dem.name
+                    with open(dem_save_path, 'wb') as f:
+                        f.write(uploaded_dem.getbuffer())
+                    st.session_state.dem_upload_other_id = uploaded_dem.file_id
+                    # Overwriting a same-name file may leave the dir mtime unchanged
+                    _scan_dems.clear()
                 st.success(f"Uploaded: {uploaded_dem.name}")
 
             # List available DEM files (including newly uploaded ones)
-            dem_files = list(dem_dir.glob("*.tif")) + list(dem_dir.glob("*.tiff"))
-
-            if dem_files:
-                dem_options = ["[Select a DEM file]"] + [dem.name for dem in dem_files]
+            try:
+                dem_dir_mtime = dem_dir.stat().st_mtime
+            except OSError:
+                # Removed while the server is running: recreate it (empty)
+                dem_dir.mkdir(parents=True, exist_ok=True)
+                dem_dir_mtime = dem_dir.stat().st_mtime
+            dem_sizes = dict(_scan_dems(str(dem_dir), dem_dir_mtime))
+
+            if dem_sizes:
+                dem_options = ["[Select a DEM file]"] + list(dem_sizes)
                 # Pre-select the just-uploaded file if available
                 default_idx = 0
                 if uploaded_dem is not None and uploaded_dem.name in dem_options:
@@ -1819,11 +2581,15 @@ with mode_tab_other:
 
                 if selected_dem != "[Select a DEM file]":
                     dem_path = dem_dir / selected_dem
-                    st.session_state.config['user_dem_path'] = str(dem_path.absolute())
+                    # Absolute paths are resolved once per DEM and session, not on every rerun
+                    dem_abs_paths = st.session_state.setdefault('_dem_abs_paths', {})
+                    if selected_dem not in dem_abs_paths:
+                        dem_abs_paths[selected_dem] = str(dem_path.absolute())
+                    st.session_state.config['user_dem_path'] = dem_abs_paths[selected_dem]
 
                     # Read DEM bounds using rasterio
                     try:
-                        with rasterio.open(dem_path) as src:
+                        with importlib.import_module('rasterio').open(dem_path) as src:
                             dem_crs = src.crs
                             dem_bounds_native = src.bounds
                             dem_width = src.width
@@ -1834,7 +2600,7 @@ with mode_tab_other:
                             is_square = 0.8 <= aspect_ratio <= 1.2
 
                             if dem_crs and str(dem_crs) != "EPSG:4326":
-                                transformer = Transformer.from_crs(dem_crs, "EPSG:4326", always_xy=True)
+                                transformer = get_transformer(dem_crs.to_string(), "EPSG:4326")
                                 min_lon, min_lat = transformer.transform(dem_bounds_native.left, dem_bounds_native.bottom)
                                 max_lon, max_lat = transformer.transform(dem_bounds_native.right, dem_bounds_native.top)
                                 dem_bounds_wgs84 = [min_lon, min_lat, max_lon, max_lat]
@@ -1854,7 +2620,7 @@ with mode_tab_other:
                             col1, col2 = st.columns(2)
                             with col1:
                                 st.success(f"DEM: {selected_dem}")
-                                st.caption(f"Size: {dem_path.stat().st_size / (1024 * 1024):.2f} MB")
+                                st.caption(f"Size: {dem_sizes[selected_dem] / (1024 * 1024):.2f} MB")
                                 st.caption(f"Dimensions: {dem_width} x {dem_height} pixels")
                             with col2:
                                 if dem_epsg is None:
@@ -1944,8 +2710,7 @@ with mode_tab_other:
             # Helper function to read vector files (reused from later in code)
             def read_roi_file(uploaded_file):
                 """Read various vector file formats and return a GeoDataFrame."""
-                import tempfile
-                import zipfile
+                gpd = importlib.import_module('geopandas')
                 file_ext = uploaded_file.name.lower().split('.')[-1]
                 gdf = None
                 if file_ext == 'zip':
@@ -2013,6 +2778,10 @@ with mode_tab_other:
                 map_center = [(bounds[1] + bounds[3]) / 2, (bounds[0] + bounds[2]) / 2]
                 map_zoom = 8
 
+            folium = importlib.import_module('folium')
+            st_folium = importlib.import_module('streamlit_folium').st_folium
+            Draw = importlib.import_module('folium.plugins').Draw
+
             opentopo_map = folium.Map(
                 location=map_center,
                 zoom_start=map_zoom,
@@ -2073,7 +2842,7 @@ with mode_tab_other:
                     st.session_state['opentopo_bounds'] = [min(lons), min(lats), max(lons), max(lats)]
                     # Store drawn geometry as GeoDataFrame for masking
                     drawn_shape = shape(drawn_geom['geometry'])
-                    st.session_state['opentopo_roi_gdf'] = gpd.GeoDataFrame(geometry=[drawn_shape], crs="EPSG:4326")
+                    st.session_state['opentopo_roi_gdf'] = importlib.import_module('geopandas').GeoDataFrame(geometry=[drawn_shape], crs="EPSG:4326")
 
             # Show bounds and download button
             if 'opentopo_bounds' in st.session_state:
@@ -2081,7 +2850,6 @@ with mode_tab_other:
                 st.info(f"Selected bounds: W={bounds[0]:.4f}, S={bounds[1]:.4f}, E={bounds[2]:.4f}, N={bounds[3]:.4f}")
 
                 # Calculate area
-                from math import radians, cos
                 lat_mid = (bounds[1] + bounds[3]) / 2
                 width_km = (bounds[2] - bounds[0]) * 111 * cos(radians(lat_mid))
                 height_km = (bounds[3] - bounds[1]) * 111
@@ -2098,7 +2866,6 @@ with mode_tab_other:
                         st.error("Area too large.")
                     else:
                         # Check cache first
-                        from src.data.cache import CacheManager
                         cache_dir = Path(get_cache_dir())
                         cache = CacheManager(cache_dir)
 
@@ -2118,7 +2885,6 @@ with mode_tab_other:
                             # Download from API
                             with st.spinner("Downloading DEM from OpenTopography..."):
                                 try:
-                                    import requests
                                     params = {
                                         'demtype': selected_dataset,
                                         'south': bounds[1],
@@ -2133,8 +2899,7 @@ with mode_tab_other:
 
                                     if response.status_code == 200:
                                         # Save to config/dem/
-                                        dem_dir = Path("config/dem")
-                                        dem_dir.mkdir(parents=True, exist_ok=True)
+                                        dem_dir = DEM_DIR
                                         filename = f"{selected_dataset}_{bounds[1]:.2f}_{bounds[0]:.2f}_{bounds[3]:.2f}_{bounds[2]:.2f}.tif"
                                         dem_path = dem_dir / filename
 
@@ -2159,7 +2924,7 @@ with mode_tab_other:
                 dem_path = Path(st.session_state.config['user_dem_path'])
                 if dem_path.exists():
                     try:
-                        with rasterio.open(dem_path) as src:
+                        with importlib.import_module('rasterio').open(dem_path) as src:
                             dem_crs = src.crs
                             dem_bounds_native = src.bounds
                             dem_width = src.width
@@ -2208,8 +2973,7 @@ with mode_tab_other:
             # Helper function to read vector files
             def read_vector_file(uploaded_file):
                 """Read various vector file formats and return a GeoDataFrame."""
-                import tempfile
-                import zipfile
+                gpd = importlib.import_module('geopandas')
 
                 file_ext = uploaded_file.name.lower().split('.')[-1]
                 gdf = None
@@ -2279,6 +3043,10 @@ with mode_tab_other:
             center_lat = (dem_bounds_wgs84[1] + dem_bounds_wgs84[3]) / 2
             center_lon = (dem_bounds_wgs84[0] + dem_bounds_wgs84[2]) / 2
 
+            folium = importlib.import_module('folium')
+            st_folium = importlib.import_module('streamlit_folium').st_folium
+            Draw = importlib.import_module('folium.plugins').Draw
+
             dem_roi_map = folium.Map(
                 location=[center_lat, center_lon],
                 zoom_start=10,
@@ -2301,8 +3069,8 @@ with mode_tab_other:
             # Add ROI if available (blue polygon)
             if gdf_roi_wgs84 is not None and len(gdf_roi_wgs84) > 0:
                 # Validate ROI is within DEM bounds
-                dem_polygon = box(dem_bounds_wgs84[0], dem_bounds_wgs84[1],
-                                  dem_bounds_wgs84[2], dem_bounds_wgs84[3])
+                dem_polygon = shapely.box(dem_bounds_wgs84[0], dem_bounds_wgs84[1],
+                                         dem_bounds_wgs84[2], dem_bounds_wgs84[3])
                 roi_union = gdf_roi_wgs84.unary_union
 
                 if dem_polygon.contains(roi_union):
@@ -2354,7 +3122,7 @@ with mode_tab_other:
                 drawn_geom = map_output['last_active_drawing']
                 try:
                     drawn_shape = shape(drawn_geom['geometry'])
-                    gdf_drawn = gpd.GeoDataFrame(geometry=[drawn_shape], crs="EPSG:4326")
+                    gdf_drawn = importlib.import_module('geopandas').GeoDataFrame(geometry=[drawn_shape], crs="EPSG:4326")
                     st.session_state['gdf_roi_other'] = gdf_drawn
                     st.rerun()
                 except Exception as e:
@@ -2371,7 +3139,7 @@ with mode_tab_other:
         st.subheader(f"{grid_section_num}. Output Grid")
         gsd_other = st.number_input(
             "Output Grid Spacing (m)",
-            value=float(st.session_state.config.get('gsd', 25.0)),
+            value=float(st.session_state.config['gsd']),
             min_value=1.0,
             max_value=1000.0,
             help="Output resolution in meters. Smaller values = higher resolution but longer processing time.",
@@ -2424,7 +3192,7 @@ with mode_tab_other:
 
         lus_constant_other = st.number_input(
             "Constant PREVAH Code",
-            value=int(st.session_state.config.get('lus_cst', 11500)),
+            value=int(st.session_state.config['lus_cst']),
             help="Single PREVAH land cover code applied to all grid cells.",
             key="lus_constant_other"
         )
@@ -2432,16 +3200,7 @@ with mode_tab_other:
         # Show PREVAH codes reference
         with st.expander("View available PREVAH codes", expanded=False):
             st.markdown("**PREVAH Land Cover Codes:**")
-            prevah_codes = {
-                "Code": [1, 2, 3, 4, 5, 6, 7, 8, 11, 13, 14, 15, 18, 19, 20, 21, 22, 23, 24, 25, 26, 27, 28, 29],
-                "Description": [
-                    "water", "settlement", "coniferous forest", "deciduous forest", "mixed forest",
-                    "cereals", "pasture", "bush", "road", "firn", "bare ice", "rock", "fruit",
-                    "vegetables", "wheat", "alpine vegetation", "wetlands", "rough pasture",
-                    "subalpine meadow", "alpine meadow", "bare soil vegetation", "free", "corn", "grapes"
-                ]
-            }
-            st.dataframe(prevah_codes, width="stretch", hide_index=True)
+            st.dataframe(PREVAH_CODES, width="stretch", hide_index=True)
             st.caption("A3D format: 1LLCD where LL is the PREVAH code (e.g., 11500 for rock)")
 
         st.divider()
@@ -2454,42 +3213,67 @@ with mode_tab_other:
         if 'poi_list' not in st.session_state:
             st.session_state.poi_list = []
 
-        # POI input form
-        with st.form("add_poi_form"):
-            col1, col2, col3, col4 = st.columns(4)
+        # The POI form and list run as a fragment: picking the row to delete
+        # reruns only this block; adding or removing a POI reruns the whole
+        # app so the POI count on the Run tab stays current
+        @st.fragment
+        def poi_section():
+            # POI input form
+            with st.form("add_poi_form"):
+                col1, col2, col3, col4 = st.columns(4)
 
-            with col1:
-                poi_name = st.text_input("Name", value="", placeholder="e.g., Station1")
-            with col2:
-                poi_x_new = st.number_input(f"Easting", value=0.0, format="%.2f", help=f"EPSG:{target_epsg}")
-            with col3:
-                poi_y_new = st.number_input(f"Northing", value=0.0, format="%.2f", help=f"EPSG:{target_epsg}")
-            with col4:
-                poi_z_new = st.number_input("Elevation (m)", value=0.0, format="%.2f")
-
-            add_button = st.form_submit_button("Add POI", width="stretch")
-
-            if add_button and poi_name:
-                st.session_state.poi_list.append({
-                    'name': poi_name,
-                    'x': poi_x_new,
-                    'y': poi_y_new,
-                    'z': poi_z_new
-                })
-                st.rerun()
-
-        # Display current POIs
-        if st.session_state.poi_list:
-            for idx, poi in enumerate(st.session_state.poi_list):
+                with col1:
+                    poi_name = st.text_input("Name", value="", placeholder="e.g., Station1")
+                with col2:
+                    poi_x_new = st.number_input(f"Easting", value=0.0, format="%.2f", help=f"EPSG:{target_epsg}")
+                with col3:
+                    poi_y_new = st.number_input(f"Northing", value=0.0, format="%.2f", help=f"EPSG:{target_epsg}")
+                with col4:
+                    poi_z_new = st.number_input("Elevation (m)", value=0.0, format="%.2f")
+
+                add_button = st.form_submit_button("Add POI", width="stretch")
+
+                if add_button and poi_name:
+                    st.session_state.poi_list.append({
+                        'name': poi_name,
+                        'x': poi_x_new,
+                        'y': poi_y_new,
+                        'z': poi_z_new
+                    })
+                    st.rerun()
+
+            # Display current POIs
+            if st.session_state.poi_list:
+                # One grid for all POIs instead of a row of widgets per POI
+                st.dataframe(
+                    st.session_state.poi_list,
+                    column_config={
+                        "x": st.column_config.NumberColumn("Easting", format="%.2f"),
+                        "y": st.column_config.NumberColumn("Northing", format="%.2f"),
+                        "z": st.column_config.NumberColumn("Elevation (m)", format="%.2f"),
+                    },
+                    width="stretch"
+                )
                 col1, col2 = st.columns([5, 1])
                 with col1:
-                    st.text(f"{poi['name']}: ({poi['x']:.2f}, {poi['y']:.2f}, {poi['z']:.2f})")
+                    remove_idx = st.number_input(
+                        "Row to delete",
+                        min_value=0,
+                        max_value=len(st.session_state.poi_list) - 1,
+                        value=0,
+                        step=1,
+                        key="remove_poi_idx"
+                    )
                 with col2:
-                    if st.button("Remove", key=f"remove_poi_{idx}", width="stretch"):
-                        st.session_state.poi_list.pop(idx)
+                    st.write("")  # Spacing
+                    st.write("")  # Spacing
+                    if st.button("Remove selected", key="remove_poi", width="stretch"):
+                        st.session_state.poi_list.pop(int(remove_idx))
                         st.rerun()
-        else:
-            st.caption("No POIs added. This is optional.")
+            else:
+                st.caption("No POIs added. This is optional.")
+
+        poi_section()
 
         st.divider()
         st.info("Continue to the next tab: **4. Run**")
@@ -2500,19 +3284,19 @@ with mode_tab_other:
     with tab4_other:
         st.header("Summary & Run")
 
-        # Summary display
-        col1, col2 = st.columns(2)
-
-        with col1:
-            st.metric("Simulation Name", simu_name_other if simu_name_other else "Not set")
-            st.metric("Coordinate System", f"EPSG:{target_epsg}")
-            st.metric("Grid Spacing", f"{gsd_other}m")
+        # Summary display: (label, value) pairs, three per column
+        metrics = [
+            ("Simulation Name", simu_name_other if simu_name_other else "Not set"),
+            ("Coordinate System", f"EPSG:{target_epsg}"),
+            ("Grid Spacing", f"{gsd_other}m"),
+            ("DEM", "Selected" if st.session_state.config.get('user_dem_path') else "Not selected"),
+            ("Land Cover", f"Constant ({lus_constant_other})"),
+            ("POIs", len(st.session_state.poi_list)),
+        ]
 
-        with col2:
-            dem_status = "Selected" if st.session_state.config.get('user_dem_path') else "Not selected"
-            st.metric("DEM", dem_status)
-            st.metric("Land Cover", f"Constant ({lus_constant_other})")
-            st.metric("POIs", len(st.session_state.poi_list))
+        metric_cols = st.columns(2)
+        for idx, (label, value) in enumerate(metrics):
+            metric_cols[idx // 3].metric(label, value)
 
         st.divider()
 
@@ -2541,45 +3325,22 @@ with mode_tab_other:
                 st.error("Please provide a config filename")
             else:
                 # Create config file for Other Locations mode
-                config_content = f"""# A3Dshell Configuration - Other Locations Mode
-# Generated: {datetime.now().strftime('%Y-%m-%dT%H:%M:%S')}
-
-[GENERAL]
-SIMULATION_NAME = {simu_name_other}
-
-[INPUT]
-DEM_MODE = user_provided
-USER_DEM_PATH = {st.session_state.config.get('user_dem_path', '')}
-TARGET_EPSG = {target_epsg}
-
-[OUTPUT]
-OUT_COORDSYS = EPSG:{target_epsg}
-GSD = {gsd_other}
-DEM_ADDFMTLIST =
-MESH_FMT = vtu
-
-[MAPS]
-PLOT_HORIZON = false
-
-[A3D]
-USE_GROUNDEYE = false
-LUS_SOURCE = {lus_source_other}
-LUS_PREVAH_CST = {lus_constant_other}
-DO_PVP_3D = false
-PVP_3D_FMT = vtu
-SP_BIN_PATH = input/bin/snowpack
-"""
-                # Save POIs to config
-                if st.session_state.poi_list:
-                    config_content += "\n[POIS]\n"
-                    for poi in st.session_state.poi_list:
-                        config_content += f"{poi['name']} = {poi['x']},{poi['y']},{poi['z']}\n"
-
-                # Save file
-                config_dir = Path("config")
-                config_path = config_dir / f"{save_config_name_other}.ini"
-                with open(config_path, 'w') as f:
-                    f.write(config_content)
+                config_path = CONFIG_DIR / f"{save_config_name_other}.ini"
+                write_other_locations_ini(
+                    config_path,
+                    "# A3Dshell Configuration - Other Locations Mode\n"
+                    f"# Generated: {datetime.now().strftime('%Y-%m-%dT%H:%M:%S')}",
+                    {
+                        'GENERAL': {'SIMULATION_NAME': simu_name_other},
+                        'INPUT': {
+                            'USER_DEM_PATH': st.session_state.config['user_dem_path'],
+                            'TARGET_EPSG': target_epsg,
+                        },
+                        'OUTPUT': {'OUT_COORDSYS': f"EPSG:{target_epsg}", 'GSD': gsd_other},
+                        'A3D': {'LUS_SOURCE': lus_source_other, 'LUS_PREVAH_CST': lus_constant_other},
+                    },
+                    st.session_state.poi_list
+                )
 
                 st.success(f"Configuration saved to: {config_path}")
 
@@ -2590,47 +3351,32 @@ SP_BIN_PATH = input/bin/snowpack
 
         log_level_other = st.selectbox("Log Level", ["INFO", "DEBUG", "WARNING", "ERROR"], key="log_level_other")
 
-        if st.button("Start Setup", type="primary", width="stretch", key="run_button_other"):
+        other_run = st.session_state.get('other_run')
+        other_run_in_progress = other_run is not None and other_run['returncode'] is None
+        if st.button("Start Setup", type="primary", width="stretch", key="run_button_other",
+                     disabled=other_run_in_progress):
             if not simu_name_other:
                 st.error("Please provide a simulation name")
             elif not st.session_state.config.get('user_dem_path'):
                 st.error("Please select a DEM file")
             else:
                 # Create temporary config for this run
-                temp_config = Path("config") / f"_temp_{simu_name_other}.ini"
-
-                config_content = f"""# Temporary A3Dshell Configuration - Other Locations
-[GENERAL]
-SIMULATION_NAME = {simu_name_other}
-
-[INPUT]
-DEM_MODE = user_provided
-USER_DEM_PATH = {st.session_state.config.get('user_dem_path', '')}
-TARGET_EPSG = {target_epsg}
-"""
-
-                config_content += "\n[OUTPUT]\n"
-                config_content += f"OUT_COORDSYS = EPSG:{target_epsg}\n"
-                config_content += "DEM_ADDFMTLIST =\n"
-                config_content += "MESH_FMT = vtu\n"
-                config_content += "\n[MAPS]\n"
-                config_content += "PLOT_HORIZON = false\n"
-                config_content += "\n[A3D]\n"
-                config_content += "USE_GROUNDEYE = false\n"
-                config_content += f"LUS_SOURCE = {lus_source_other}\n"
-                config_content += f"LUS_PREVAH_CST = {lus_constant_other}\n"
-                config_content += "DO_PVP_3D = false\n"
-                config_content += "PVP_3D_FMT = vtu\n"
-                config_content += "SP_BIN_PATH = input/bin/snowpack\n"
-
-                # Add POIs
-                if st.session_state.poi_list:
-                    config_content += "\n[POIS]\n"
-                    for poi in st.session_state.poi_list:
-                        config_content += f"{poi['name']} = {poi['x']},{poi['y']},{poi['z']}\n"
-
-                with open(temp_config, 'w') as f:
-                    f.write(config_content)
+                temp_config = CONFIG_DIR / f"_temp_{simu_name_other}.ini"
+
+                write_other_locations_ini(
+                    temp_config,
+                    "# Temporary A3Dshell Configuration - Other Locations",
+                    {
+                        'GENERAL': {'SIMULATION_NAME': simu_name_other},
+                        'INPUT': {
+                            'USER_DEM_PATH': st.session_state.config['user_dem_path'],
+                            'TARGET_EPSG': target_epsg,
+                        },
+                        'OUTPUT': {'OUT_COORDSYS': f"EPSG:{target_epsg}"},
+                        'A3D': {'LUS_SOURCE': lus_source_other, 'LUS_PREVAH_CST': lus_constant_other},
+                    },
+                    st.session_state.poi_list
+                )
 
                 # Run command (no Snowpack preprocessing for Other Locations)
                 cmd = [
@@ -2640,40 +3386,47 @@ TARGET_EPSG = {target_epsg}
                     "--skip-snowpack"  # Always skip Snowpack for Other Locations
                 ]
 
-                # Run with real-time output streaming
-                st.subheader("Run Log")
-                log_container = st.container(height=400)
-                log_placeholder = log_container.empty()
-                full_log = []
-
+                # Run in the background; the full log goes to disk
+                log_path = Path("output") / f"{simu_name_other}_run.log"
                 try:
-                    process = subprocess.Popen(
-                        cmd,
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.STDOUT,
-                        text=True,
-                        bufsize=1
-                    )
-
-                    for line in process.stdout:
-                        full_log.append(line.rstrip())
-                        log_placeholder.code('\n'.join(full_log), language="text")
-
-                    process.wait()
-
-                    if process.returncode == 0:
-                        st.success("✅ Setup completed successfully!")
-                        st.info(f"**Next Steps**: Add your SMET meteorological files to `output/{simu_name_other}/input/meteo/`")
-                    else:
-                        st.error(f"❌ Setup failed with exit code {process.returncode}")
-
+                    other_run = {
+                        'process': start_run(cmd, log_path),
+                        'cmd': cmd,
+                        'simu_name': simu_name_other,
+                        'log_path': log_path,
+                        'temp_config': temp_config,
+                        'returncode': None,
+                    }
+                    st.session_state['other_run'] = other_run
+                    other_run_in_progress = True
                 except Exception as e:
                     st.error(f"❌ Error running setup: {str(e)}")
-
-                finally:
-                    # Clean up temp config
-                    if temp_config.exists():
-                        temp_config.unlink()
+                    temp_config.unlink(missing_ok=True)
+
+        if other_run:
+            # Only the log view reruns while the setup is in progress; it is
+            # redrawn from the bounded log tail at a fixed interval
+            st.subheader("Run Log")
+            st.fragment(
+                run_log_view,
+                run_every=LOG_REFRESH_SECONDS if other_run_in_progress else None
+            )(other_run)
+
+            if other_run['returncode'] is not None:
+                if other_run['returncode'] == 0:
+                    st.success("✅ Setup completed successfully!")
+                    st.info(f"**Next Steps**: Add your SMET meteorological files to `output/{other_run['simu_name']}/input/meteo/`")
+                else:
+                    st.error(f"❌ Setup failed with exit code {other_run['returncode']}")
+
+# Keep polling runs in progress whichever tab is open (after the tabs, so a
+# run started in this script run is included)
+runs_in_progress = [
+    run for run in (st.session_state.get('swiss_run'), st.session_state.get('other_run'))
+    if run is not None and run['returncode'] is None
+]
+if runs_in_progress:
+    st.fragment(watch_runs, run_every=LOG_REFRESH_SECONDS)(runs_in_progress)
 
 # Footer
 st.divider()
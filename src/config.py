@@ -9,6 +9,7 @@ import configparser
 import logging
 import os
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass, field
@@ -29,6 +30,11 @@ CACHE_DIR = Path(os.environ.get('A3D_CACHE_DIR', './cache'))
 OUTPUT_DIR = Path(os.environ.get('A3D_OUTPUT_DIR', './output'))
 TEMPLATE_DIR = Path(os.environ.get('A3D_TEMPLATE_DIR', './input/templates'))
 
+# Feature flags (enabled in docker-compose.yml for local Docker builds)
+_TRUE_VALUES = ('true', '1', 'yes')
+IMIS_AVAILABLE = os.environ.get('A3D_IMIS_AVAILABLE', '').lower() in _TRUE_VALUES
+RUN_TAB_ENABLED = os.environ.get('A3D_ENABLE_RUN_TAB', '').lower() in _TRUE_VALUES
+
 
 def get_snowpack_bin() -> str:
     """Get Snowpack binary path from environment or default."""
@@ -45,6 +51,16 @@ def get_alpine3d_bin() -> str:
     return ALPINE3D_BIN
 
 
+def is_imis_available() -> bool:
+    """Whether the SLF/IMIS database is reachable (requires VPN, local Docker only)."""
+    return IMIS_AVAILABLE
+
+
+def is_run_tab_enabled() -> bool:
+    """Whether the Run A3D tab is enabled (local Docker only)."""
+    return RUN_TAB_ENABLED
+
+
 def get_cache_dir() -> Path:
     """Get cache directory path from environment or default."""
     CACHE_DIR.mkdir(parents=True, exist_ok=True)
@@ -62,6 +78,24 @@ def get_template_dir() -> Path:
     return TEMPLATE_DIR
 
 
+@lru_cache(maxsize=1)
+def get_build_info() -> Optional[str]:
+    """
+    Read BUILD_INFO.txt if it exists (Docker environment).
+
+    The file is written at image build time, so it is read once per process.
+    This lives here rather than in gui_app.py because Streamlit re-executes
+    the app script on every rerun, which would reset a memoized function.
+
+    Returns:
+        Build information text, or None if not found
+    """
+    try:
+        return Path("BUILD_INFO.txt").read_text()
+    except OSError:
+        return None
+
+
 @dataclass
 class SimulationConfig:
     """Configuration for A3D simulation."""
@@ -872,6 +872,35 @@ fields = easting northing altitude #altitude here is in epsg (~amsl)
 [DATA]
 """
 
+# =============================================================================
+# Other Locations Config Template
+# =============================================================================
+
+OTHER_LOCATIONS_INI_TEMPLATE = """[GENERAL]
+SIMULATION_NAME =
+
+[INPUT]
+DEM_MODE = user_provided
+USER_DEM_PATH =
+TARGET_EPSG =
+
+[OUTPUT]
+OUT_COORDSYS =
+DEM_ADDFMTLIST =
+MESH_FMT = vtu
+
+[MAPS]
+PLOT_HORIZON = false
+
+[A3D]
+USE_GROUNDEYE = false
+LUS_SOURCE = constant
+LUS_PREVAH_CST =
+DO_PVP_3D = false
+PVP_3D_FMT = vtu
+SP_BIN_PATH = input/bin/snowpack
+"""
+
 # =============================================================================
 # LUS-specific SNO Templates
 # =============================================================================
@@ -1029,6 +1058,7 @@ TEMPLATES = {
     'template_complex.sno': TEMPLATE_COMPLEX_SNO,
     'template.pv': TEMPLATE_PV,
     'poi.smet': POI_SMET_TEMPLATE,
+    'otherLocations.ini': OTHER_LOCATIONS_INI_TEMPLATE,
 }
 
 